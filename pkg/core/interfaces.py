@@ -1,5 +1,6 @@
+import heapq
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Callable, Optional, TypeVar
+from typing import AsyncIterator, List, Dict, Any, Callable, Optional, Tuple, TypeVar
 from pydantic import BaseModel
 
 T = TypeVar("T", bound=BaseModel)
@@ -43,6 +44,23 @@ class GraphStore(ABC):
         """Add or update an edge."""
         pass
 
+    async def add_nodes_bulk(self, nodes: List[Tuple[str, List[str], Dict[str, Any]]]):
+        """Add or update many (node_id, labels, properties) nodes, in order."""
+        for node_id, labels, properties in nodes:
+            await self.add_node(node_id, labels, properties)
+
+    async def add_edges_bulk(self, edges: List[Tuple[str, str, str, Dict[str, Any]]]):
+        """Add or update many (source_id, target_id, relation_type, properties) edges, in order."""
+        for source_id, target_id, relation_type, properties in edges:
+            await self.add_edge(source_id, target_id, relation_type, properties)
+
+    def get_version(self) -> Optional[int]:
+        """
+        Monotonic counter bumped on every mutation, for cheap change detection.
+        None means the store can't tell (e.g. it is shared with other writers).
+        """
+        return None
+
     @abstractmethod
     async def get_all_nodes(self) -> List[Dict[str, Any]]:
         """Retrieve all nodes."""
@@ -52,3 +70,37 @@ class GraphStore(ABC):
     async def get_all_edges(self) -> List[Dict[str, Any]]:
         """Retrieve all edges."""
         pass
+
+    async def iter_all_nodes(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all nodes. Stores that can avoid materializing the full list should override."""
+        for node in await self.get_all_nodes():
+            yield node
+
+    async def iter_all_edges(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all edges. Stores that can avoid materializing the full list should override."""
+        for edge in await self.get_all_edges():
+            yield edge
+
+    async def count_nodes_by_type(self) -> Dict[str, int]:
+        """Node count per "type" property ("unknown" when missing)."""
+        counts: Dict[str, int] = {}
+        async for node in self.iter_all_nodes():
+            key = node.get("type", "unknown")
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    async def count_edges_by_protocol(self) -> Dict[str, int]:
+        """Edge count per "protocol" property ("unknown" when missing)."""
+        counts: Dict[str, int] = {}
+        async for edge in self.iter_all_edges():
+            key = edge.get("protocol", "unknown")
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    async def sum_bytes_by_target(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """The `limit` edge targets with the most total "byte_count", largest first."""
+        totals: Dict[str, int] = {}
+        async for edge in self.iter_all_edges():
+            target = edge.get("target", "unknown")
+            totals[target] = totals.get(target, 0) + edge.get("byte_count", 0)
+        return heapq.nlargest(limit, totals.items(), key=lambda x: x[1])
@@ -1,8 +1,11 @@
 # Comprehensive List of GenAI and ML Service Domains
 # Organized by Category — 120+ domains for Shadow AI detection
 
-# Category map for alert enrichment
-AI_DOMAIN_CATEGORIES = {
+from functools import lru_cache
+from types import MappingProxyType
+
+# Category map for alert enrichment (read-only; fixed at import)
+AI_DOMAIN_CATEGORIES = MappingProxyType({
     # ═══ Major LLM Providers ═══
     "openai.com": "LLM", "api.openai.com": "LLM", "chatgpt.com": "LLM",
     "oaistatic.com": "LLM", "oaiusercontent.com": "LLM", "chat.openai.com": "LLM",
@@ -133,33 +136,49 @@ AI_DOMAIN_CATEGORIES = {
     "neptune.ai": "ML Infra",
     "mlflow.org": "ML Infra",
     "kaggle.com": "ML Infra",
-}
+})
+
+# Frozen set for fast lookups (backward compatible)
+AI_DOMAINS = frozenset(AI_DOMAIN_CATEGORIES)
 
-# Set for fast lookups (backward compatible)
-AI_DOMAINS = set(AI_DOMAIN_CATEGORIES.keys())
+def _build_domain_trie(categories: dict) -> dict:
+    """
+    Build a label trie keyed by reversed domain labels (TLD first).
+    Each node maps label -> child node; the None key holds the category
+    of the domain ending at that node (labels are always str).
+    """
+    root = {}
+    for domain, category in categories.items():
+        node = root
+        for label in reversed(domain.lower().strip().split('.')):
+            node = node.setdefault(label, {})
+        node[None] = category
+    return root
+
+_DOMAIN_TRIE = _build_domain_trie(AI_DOMAIN_CATEGORIES)
+
+@lru_cache(maxsize=4096)
+def _lookup_category(domain: str) -> str:
+    """Trie walk for an already-normalized domain. Memoized, since the same
+    destinations recur across most flows."""
+    node = _DOMAIN_TRIE
+    category = None
+    for label in reversed(domain.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        category = node.get(None, category)
+    return category
 
 def get_ai_category(domain: str) -> str:
-    """Return the AI category for a domain, or None if not an AI domain."""
+    """
+    Return the AI category for a domain, or None if not an AI domain.
+    Longest-suffix match over the label trie, so subdomains of any depth
+    resolve to their closest known parent.
+    """
     if not domain:
         return None
-    domain = domain.lower().strip()
-
-    # Exact match
-    if domain in AI_DOMAIN_CATEGORIES:
-        return AI_DOMAIN_CATEGORIES[domain]
-
-    # Parent/subdomain match
-    parts = domain.split('.')
-    if len(parts) >= 2:
-        parent = ".".join(parts[-2:])
-        if parent in AI_DOMAIN_CATEGORIES:
-            return AI_DOMAIN_CATEGORIES[parent]
-    if len(parts) >= 3:
-        grandparent = ".".join(parts[-3:])
-        if grandparent in AI_DOMAIN_CATEGORIES:
-            return AI_DOMAIN_CATEGORIES[grandparent]
-
-    return None
+    return _lookup_category(domain.lower().strip())
 
 def is_ai_domain(domain: str) -> bool:
     """
@@ -4,14 +4,32 @@ CIDR-Based Threat Intelligence — IP-level AI provider detection.
 Matches destination IPs against known CIDR blocks owned by AI service providers.
 Catches traffic that bypasses DNS (direct IP, SDK-pinned endpoints, VPN tunnels).
 
-Uses Python's stdlib `ipaddress` — zero external dependencies.
+Uses Python's stdlib `ipaddress` and `socket` — zero external dependencies.
 """
 import ipaddress
+import socket
+import struct
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, List
 
 
-@dataclass
+# Compliance frameworks as bit flags, so downstream filters are a single AND
+# (e.g. `match.compliance_mask & COMPLIANCE_FLAGS["HIPAA"]`).
+COMPLIANCE_FLAGS = {"SOC2": 1, "GDPR": 2, "HIPAA": 4}
+
+
+def compliance_mask(tags) -> int:
+    """Encode a list of compliance tag names as a COMPLIANCE_FLAGS bitmask."""
+    mask = 0
+    for tag in tags:
+        mask |= COMPLIANCE_FLAGS[tag]
+    return mask
+
+
+@dataclass(slots=True)
 class ThreatIntelMatch:
     """Result of a successful CIDR match."""
     ip: str
@@ -21,7 +39,12 @@ class ThreatIntelMatch:
     risk_level: str          # CRITICAL, HIGH, MEDIUM
     category: str            # LLM, Image Gen, Code AI, ML Infra
     data_risk: str           # Human-readable risk description
-    compliance_tags: list    # ["SOC2", "GDPR", "HIPAA"]
+    compliance_mask: int     # COMPLIANCE_FLAGS bits
+
+    @property
+    def compliance_tags(self) -> list:
+        """Decoded tag names, e.g. ["SOC2", "GDPR", "HIPAA"]."""
+        return [tag for tag, bit in COMPLIANCE_FLAGS.items() if self.compliance_mask & bit]
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -189,24 +212,106 @@ AI_CIDR_DATABASE = [
 ]
 
 
+# Private/reserved/loopback/multicast ranges, merged into sorted disjoint
+# inclusive [lo, hi] integer bounds. Mirrors ipaddress' is_private /
+# is_loopback / is_multicast for IPv4 and is checked with one bisect.
+def _merge_ranges(cidrs):
+    bounds = []
+    for net in sorted(map(ipaddress.ip_network, cidrs)):
+        lo, hi = int(net.network_address), int(net.broadcast_address)
+        if bounds and lo <= bounds[-1][1] + 1:
+            bounds[-1][1] = max(bounds[-1][1], hi)
+        else:
+            bounds.append([lo, hi])
+    return array("I", [lo for lo, _ in bounds]), array("I", [hi for _, hi in bounds])
+
+
+_RESERVED_LO, _RESERVED_HI = _merge_ranges((
+    "0.0.0.0/8", "10.0.0.0/8", "127.0.0.0/8", "169.254.0.0/16",
+    "172.16.0.0/12", "192.0.0.0/29", "192.0.0.170/31", "192.0.2.0/24",
+    "192.168.0.0/16", "198.18.0.0/15", "198.51.100.0/24", "203.0.113.0/24",
+    "224.0.0.0/4", "240.0.0.0/4", "255.255.255.255/32",
+))
+
+_unpack_ipv4 = struct.Struct(">I").unpack
+
+
 class CIDRMatcher:
     """
     High-performance CIDR-based IP matcher.
 
-    Pre-parses all CIDR strings into ipaddress.ip_network objects at init time.
-    Lookup is O(N) worst case where N = number of CIDR entries (~15).
-    For production scale, this could be replaced with a radix/Patricia trie.
+    Pre-parses all CIDR strings at init time into a binary radix trie keyed
+    on the 32-bit integer form of each network address, then flattens the
+    trie's longest-prefix answers into a sorted array of disjoint ranges.
+    Lookup is a single C-level bisect over that array: O(log N) integer
+    compares, with nested blocks still resolved to the most specific CIDR.
     """
 
     def __init__(self):
         self._entries = []
+        # Trie nodes are [child_0, child_1, entry]
+        root = [None, None, None]
         for entry in AI_CIDR_DATABASE:
             try:
                 network = ipaddress.ip_network(entry["cidr"], strict=False)
-                self._entries.append((network, entry))
             except ValueError as e:
                 # Skip malformed entries silently in production
-                pass
+                continue
+            self._entries.append((network, entry))
+            if network.version == 4:
+                # Resolve the dict into ThreatIntelMatch field order once, so
+                # a hit only has to prepend the queried IP.
+                fields = (
+                    entry["cidr"], entry["provider"], entry["service"],
+                    entry["risk_level"], entry["category"], entry["data_risk"],
+                    compliance_mask(entry["compliance_tags"]),
+                )
+                self._insert(root, int(network.network_address), network.prefixlen, fields)
+
+        # _range_starts[i] is the first address of range i; every address up
+        # to the next start maps to _range_entries[i] (None = no match).
+        self._range_starts = array("I")
+        self._range_entries = []
+        self._flatten(root, 0, 0, None)
+
+        # Destination IPs repeat heavily (same SaaS endpoints), so remember
+        # recent answers; the cache is per instance since it keys on ip_str only
+        self._lookup_cached = lru_cache(maxsize=16384)(self._lookup_uncached)
+
+    @staticmethod
+    def _insert(root: list, base: int, prefixlen: int, entry: tuple):
+        """Insert a network into the trie, one node per prefix bit."""
+        node = root
+        for shift in range(31, 31 - prefixlen, -1):
+            bit = (base >> shift) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, None]
+            node = child
+        node[2] = entry
+
+    def _flatten(self, node: list, base: int, depth: int, best: Optional[tuple]):
+        """Walk the trie in address order, emitting a range at every point
+        where the longest-prefix answer changes."""
+        if node[2] is not None:
+            best = node[2]
+        if node[0] is None and node[1] is None:
+            self._emit_range(base, best)
+            return
+        span = 1 << (31 - depth)
+        for bit in (0, 1):
+            start = base + bit * span
+            child = node[bit]
+            if child is None:
+                self._emit_range(start, best)
+            else:
+                self._flatten(child, start, depth + 1, best)
+
+    def _emit_range(self, start: int, entry: Optional[tuple]):
+        if self._range_entries and self._range_entries[-1] is entry:
+            return
+        self._range_starts.append(start)
+        self._range_entries.append(entry)
 
     def lookup(self, ip_str: str) -> Optional[ThreatIntelMatch]:
         """
@@ -216,31 +321,26 @@ class CIDRMatcher:
             ip_str: IPv4 address string (e.g., "13.107.42.14")
 
         Returns:
-            ThreatIntelMatch if found, None otherwise
+            ThreatIntelMatch if found, None otherwise.
+            The instance is shared across lookups — treat it as read-only.
         """
+        return self._lookup_cached(ip_str)
+
+    def _lookup_uncached(self, ip_str: str) -> Optional[ThreatIntelMatch]:
         try:
-            addr = ipaddress.ip_address(ip_str)
-        except ValueError:
+            ip_int = _unpack_ipv4(socket.inet_pton(socket.AF_INET, ip_str))[0]
+        except (OSError, TypeError):
             return None
 
         # Skip private/reserved IPs immediately
-        if addr.is_private or addr.is_loopback or addr.is_multicast:
+        i = bisect_right(_RESERVED_LO, ip_int) - 1
+        if i >= 0 and ip_int <= _RESERVED_HI[i]:
             return None
 
-        for network, entry in self._entries:
-            if addr in network:
-                return ThreatIntelMatch(
-                    ip=ip_str,
-                    cidr=entry["cidr"],
-                    provider=entry["provider"],
-                    service=entry["service"],
-                    risk_level=entry["risk_level"],
-                    category=entry["category"],
-                    data_risk=entry["data_risk"],
-                    compliance_tags=entry["compliance_tags"],
-                )
-
-        return None
+        fields = self._range_entries[bisect_right(self._range_starts, ip_int) - 1]
+        if fields is None:
+            return None
+        return ThreatIntelMatch(ip_str, *fields)
 
     def enrich_destinations(self, ip_list: list) -> List[ThreatIntelMatch]:
         """
@@ -253,13 +353,10 @@ class CIDRMatcher:
             List of ThreatIntelMatch objects (only matches)
         """
         matches = []
-        seen = set()
-        for ip in ip_list:
-            if ip not in seen:
-                seen.add(ip)
-                match = self.lookup(ip)
-                if match:
-                    matches.append(match)
+        for ip in dict.fromkeys(ip_list):
+            match = self.lookup(ip)
+            if match:
+                matches.append(match)
         return matches
 
     def get_all_providers(self) -> list:
@@ -19,11 +19,12 @@ References:
     - https://engineering.salesforce.com/tls-fingerprinting-with-ja3-and-ja3s/
     - https://ja3er.com/
 """
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, List, Dict, Mapping
 
 
-@dataclass
+@dataclass(slots=True)
 class JA3Match:
     """Result of a successful JA3 fingerprint match."""
     ja3_hash: str
@@ -31,8 +32,9 @@ class JA3Match:
     category: str             # "browser", "scripting", "attack_tool", "bot", "proxy"
     risk_level: str           # "CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"
     description: str          # Human-readable explanation
-    expected_ua_patterns: list = field(default_factory=list)  # UA strings this client should have
-    tags: list = field(default_factory=list)  # ["spoofing_risk", "known_malware", "automation"]
+    expected_ua_patterns: tuple = ()  # UA strings this client should have
+    tags: tuple = ()                  # ("spoofing_risk", "known_malware", "automation")
+    short_hash: str = ""              # "abcdef012345..." for alert/log text
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -228,18 +230,57 @@ JA3_DATABASE: List[Dict] = [
 ]
 
 
+# Substrings that mark a User-Agent as claiming to be a web browser
+BROWSER_INDICATORS = ("chrome", "firefox", "safari", "edge", "mozilla")
+
+# Categories whose clients are not browsers and so must not claim to be one
+NON_BROWSER_CATEGORIES = frozenset(("scripting", "attack_tool", "bot", "proxy"))
+
+
+def _build_index() -> Dict[str, JA3Match]:
+    """Build one immutable JA3Match per database entry, keyed by hash."""
+    index = {}
+    for entry in JA3_DATABASE:
+        index[entry["ja3_hash"]] = JA3Match(
+            ja3_hash=entry["ja3_hash"],
+            client_name=entry["client_name"],
+            category=entry["category"],
+            risk_level=entry["risk_level"],
+            description=entry["description"],
+            expected_ua_patterns=tuple(entry.get("expected_ua_patterns", ())),
+            tags=tuple(entry.get("tags", ())),
+            short_hash=f"{entry['ja3_hash'][:12]}...",
+        )
+    return index
+
+
+# Built once at import and shared by every JA3Matcher
+_JA3_BY_HASH: Dict[str, JA3Match] = _build_index()
+JA3_BY_HASH: Mapping[str, JA3Match] = MappingProxyType(_JA3_BY_HASH)
+
+# Fingerprints for which a browser-like UA means spoofing: non-browser
+# clients whose own expected UA patterns contain no browser strings (some
+# tools legitimately send Mozilla-prefixed UAs). Static per entry.
+_SPOOF_CANDIDATES = frozenset(
+    h for h, m in _JA3_BY_HASH.items()
+    if m.category in NON_BROWSER_CATEGORIES
+    and not any(b in pat.lower() for pat in m.expected_ua_patterns for b in BROWSER_INDICATORS)
+)
+
+
 class JA3Matcher:
     """
     High-performance JA3 fingerprint matcher.
 
-    Pre-indexes all fingerprints into a hash map at init time for O(1) lookup.
-    Also provides User-Agent mismatch detection for spoofing analysis.
+    Fingerprints are pre-built into JA3Match instances once at import, so
+    lookup is an O(1) probe returning a shared instance and constructing a
+    matcher is free. Also provides User-Agent mismatch detection for
+    spoofing analysis.
     """
 
     def __init__(self):
-        self._index: Dict[str, Dict] = {}
-        for entry in JA3_DATABASE:
-            self._index[entry["ja3_hash"]] = entry
+        self._index = _JA3_BY_HASH
+        self._spoof_candidates = _SPOOF_CANDIDATES
 
     def lookup(self, ja3_hash: str) -> Optional[JA3Match]:
         """
@@ -249,23 +290,13 @@ class JA3Matcher:
             ja3_hash: MD5 hash string (32 hex characters)
 
         Returns:
-            JA3Match if the fingerprint is known, None otherwise
+            JA3Match if the fingerprint is known, None otherwise.
+            The instance is shared across lookups — treat it as read-only.
         """
         if not ja3_hash or len(ja3_hash) != 32:
             return None
 
-        entry = self._index.get(ja3_hash)
-        if entry:
-            return JA3Match(
-                ja3_hash=entry["ja3_hash"],
-                client_name=entry["client_name"],
-                category=entry["category"],
-                risk_level=entry["risk_level"],
-                description=entry["description"],
-                expected_ua_patterns=entry.get("expected_ua_patterns", []),
-                tags=entry.get("tags", []),
-            )
-        return None
+        return self._index.get(ja3_hash)
 
     def detect_spoofing(self, ja3_hash: str, user_agent: str) -> Optional[Dict]:
         """
@@ -281,47 +312,30 @@ class JA3Matcher:
         Returns:
             Dict with spoofing details if mismatch detected, None otherwise
         """
-        match = self.lookup(ja3_hash)
-        if not match or not user_agent:
+        if not user_agent:
             return None
 
-        # Skip browsers — their UA is expected to match
-        if match.category == "browser":
+        # Browsers, and tools that legitimately send browser-like UAs, can't spoof
+        match = self.lookup(ja3_hash)
+        if match is None or match.ja3_hash not in self._spoof_candidates:
             return None
 
-        # Check if the User-Agent pretends to be something else
+        # Check if the User-Agent pretends to be a browser
         ua_lower = user_agent.lower()
-        browser_indicators = ["chrome", "firefox", "safari", "edge", "mozilla"]
-
-        claims_browser = any(indicator in ua_lower for indicator in browser_indicators)
-        is_not_browser = match.category in ("scripting", "attack_tool", "bot", "proxy")
-
-        if claims_browser and is_not_browser:
-            # Check if ANY expected UA pattern matches (some tools do use Mozilla prefixes)
-            expected_match = any(
-                pat.lower() in ua_lower for pat in match.expected_ua_patterns
-            )
-            # If the expected patterns DON'T include browser strings, this is spoofing
-            expected_has_browser = any(
-                b in pat.lower()
-                for pat in match.expected_ua_patterns
-                for b in browser_indicators
-            )
-
-            if not expected_has_browser:
-                return {
-                    "spoofing_detected": True,
-                    "ja3_client": match.client_name,
-                    "ja3_category": match.category,
-                    "claimed_ua": user_agent[:100],  # Truncate for safety
-                    "risk_level": "CRITICAL",
-                    "description": (
-                        f"Identity spoofing: TLS fingerprint identifies {match.client_name} "
-                        f"but User-Agent claims to be a browser"
-                    ),
-                }
-
-        return None
+        if not any(indicator in ua_lower for indicator in BROWSER_INDICATORS):
+            return None
+
+        return {
+            "spoofing_detected": True,
+            "ja3_client": match.client_name,
+            "ja3_category": match.category,
+            "claimed_ua": user_agent[:100],  # Truncate for safety
+            "risk_level": "CRITICAL",
+            "description": (
+                f"Identity spoofing: TLS fingerprint identifies {match.client_name} "
+                f"but User-Agent claims to be a browser"
+            ),
+        }
 
     def is_known_bad(self, ja3_hash: str) -> bool:
         """Quick check if a JA3 hash belongs to a known attack tool."""
@@ -332,12 +346,12 @@ class JA3Matcher:
         """Get a summary of all tracked fingerprints for API/dashboard exposure."""
         return [
             {
-                "ja3_hash": e["ja3_hash"],
-                "client_name": e["client_name"],
-                "category": e["category"],
-                "risk_level": e["risk_level"],
+                "ja3_hash": m.ja3_hash,
+                "client_name": m.client_name,
+                "category": m.category,
+                "risk_level": m.risk_level,
             }
-            for e in JA3_DATABASE
+            for m in self._index.values()
         ]
 
     @property
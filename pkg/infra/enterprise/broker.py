@@ -62,11 +62,10 @@ class KafkaBroker(EventBroker):
     async def _consume_loop(self, consumer, callback):
         try:
             async for msg in consumer:
-                # We need to reconstruct the Pydantic model. 
-                # This part requires knowing the Model Class, which `EventBroker` abstractly handles via BaseModel.
-                # Ideally, the callback handles dict->Model conversion, or we pass a generic type.
-                # For this implementation, we assume callback accepts a Dict or generic object.
-                data = json.loads(msg.value)
+                # The broker doesn't know the model class, so the raw JSON bytes
+                # go to the callback, which can validate them straight into its
+                # model (e.g. model_validate_json) without a dict round trip.
+                data = msg.value
                 if asyncio.iscoroutinefunction(callback):
                     await callback(data)
                 else:
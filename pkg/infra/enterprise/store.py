@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from itertools import groupby
+from typing import List, Dict, Any, Tuple
 from neo4j import AsyncGraphDatabase
 from pkg.core.interfaces import GraphStore
 from loguru import logger
@@ -36,6 +37,41 @@ class Neo4jStore(GraphStore):
         except Exception as e:
             logger.error(f"Neo4j add_edge error: {e}")
 
+    async def add_nodes_bulk(self, nodes: List[Tuple[str, List[str], Dict[str, Any]]]):
+        """Merge many nodes with one UNWIND query per run of rows sharing a label set."""
+        # Labels can't be parameterized in Cypher, so batch consecutive rows
+        # with the same label set; runs are written in input order, so later
+        # updates to a node still win
+        try:
+            async with self.driver.session() as session:
+                for labels, run in groupby(nodes, key=lambda n: tuple(n[1])):
+                    rows = [{"id": node_id, "props": properties} for node_id, _, properties in run]
+                    label_str = "".join([f":{label}" for label in labels])
+                    query = f"UNWIND $rows AS row MERGE (n{label_str} {{id: row.id}}) SET n += row.props"
+                    await session.run(query, rows=rows)
+        except Exception as e:
+            logger.error(f"Neo4j add_nodes_bulk error: {e}")
+
+    async def add_edges_bulk(self, edges: List[Tuple[str, str, str, Dict[str, Any]]]):
+        """Merge many edges with one UNWIND query per relation type."""
+        by_relation: Dict[str, list] = {}
+        for source_id, target_id, relation_type, properties in edges:
+            by_relation.setdefault(relation_type, []).append(
+                {"source_id": source_id, "target_id": target_id, "props": properties}
+            )
+        try:
+            async with self.driver.session() as session:
+                for relation_type, rows in by_relation.items():
+                    query = f"""
+                    UNWIND $rows AS row
+                    MATCH (a {{id: row.source_id}}), (b {{id: row.target_id}})
+                    MERGE (a)-[r:{relation_type}]->(b)
+                    SET r += row.props
+                    """
+                    await session.run(query, rows=rows)
+        except Exception as e:
+            logger.error(f"Neo4j add_edges_bulk error: {e}")
+
     async def get_all_nodes(self) -> List[Dict[str, Any]]:
         query = "MATCH (n) RETURN n"
         nodes = []
@@ -66,3 +102,43 @@ class Neo4jStore(GraphStore):
         except Exception as e:
             logger.error(f"Neo4j get_edges error: {e}")
         return edges
+
+    async def count_nodes_by_type(self) -> Dict[str, int]:
+        query = "MATCH (n) RETURN coalesce(n.type, 'unknown') AS type, count(*) AS count"
+        counts = {}
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(query)
+                async for record in result:
+                    counts[record["type"]] = record["count"]
+        except Exception as e:
+            logger.error(f"Neo4j count_nodes_by_type error: {e}")
+        return counts
+
+    async def count_edges_by_protocol(self) -> Dict[str, int]:
+        query = "MATCH ()-[r]->() RETURN coalesce(r.protocol, 'unknown') AS protocol, count(*) AS count"
+        counts = {}
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(query)
+                async for record in result:
+                    counts[record["protocol"]] = record["count"]
+        except Exception as e:
+            logger.error(f"Neo4j count_edges_by_protocol error: {e}")
+        return counts
+
+    async def sum_bytes_by_target(self, limit: int = 10) -> List[Tuple[str, int]]:
+        query = """
+        MATCH ()-[r]->(b)
+        RETURN b.id AS target, sum(coalesce(r.byte_count, 0)) AS bytes
+        ORDER BY bytes DESC LIMIT $limit
+        """
+        top = []
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(query, limit=limit)
+                async for record in result:
+                    top.append((record["target"], record["bytes"]))
+        except Exception as e:
+            logger.error(f"Neo4j sum_bytes_by_target error: {e}")
+        return top
@@ -9,12 +9,87 @@ Usage:
     await store.initialize()
     await store.add_node("192.168.1.10", ["Node"], {"type": "internal"})
 """
+import asyncio
 import json
 import aiosqlite
-from typing import List, Dict, Any
+from itertools import groupby
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from pkg.core.interfaces import GraphStore
 from loguru import logger
 
+# orjson is optional: several times faster for the per-row (de)serialization
+# below. SQLite's JSON functions need TEXT, so encoded bytes are decoded.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+# Creates an edge endpoint as an "Unknown" node unless it already exists
+_ENSURE_NODE_SQL = """
+    INSERT OR IGNORE INTO nodes (id, labels, properties)
+    VALUES (?, '["Unknown"]', '{}')
+"""
+
+_EDGE_UPSERT_SQL = """
+    INSERT INTO edges (source, target, relation, properties)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(source, target, relation)
+    DO UPDATE SET properties = excluded.properties
+    WHERE edges.properties IS NOT excluded.properties
+"""
+
+
+# Node UPSERT. On conflict, labels become the sorted union of old and new
+# (UNION over json_each) and properties are shallow-merged with json_patch,
+# which keeps existing keys in place, appends new ones and copies number
+# literals verbatim (no float rounding). It works for any key name, but merge
+# patch recurses into objects and deletes keys set to null, so nodes with such
+# values take the Python merge below instead (see _patchable). The update is
+# skipped when the merged values equal what is already stored, so
+# re-announcing a node unchanged writes nothing.
+_MERGED_LABELS = """(
+    SELECT json_group_array(value) FROM (
+        SELECT value FROM json_each(nodes.labels)
+        UNION
+        SELECT value FROM json_each(excluded.labels)
+    )
+)"""
+
+_MERGED_PROPERTIES = "json_patch(nodes.properties, excluded.properties)"
+
+_NODE_UPSERT_SQL = f"""
+    INSERT INTO nodes (id, labels, properties) VALUES (?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        labels = {_MERGED_LABELS},
+        properties = {_MERGED_PROPERTIES}
+    WHERE nodes.labels IS NOT {_MERGED_LABELS}
+       OR nodes.properties IS NOT {_MERGED_PROPERTIES}
+"""
+
+# Python merge path: read the row, merge, then write the result as-is
+_NODE_SELECT_SQL = "SELECT labels, properties FROM nodes WHERE id = ?"
+
+_NODE_REPLACE_SQL = """
+    INSERT INTO nodes (id, labels, properties) VALUES (?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        labels = excluded.labels,
+        properties = excluded.properties
+    WHERE nodes.labels IS NOT excluded.labels
+       OR nodes.properties IS NOT excluded.properties
+"""
+
+
+def _patchable(properties: Dict[str, Any]) -> bool:
+    """True if json_patch merges these properties exactly like dict.update()."""
+    return not any(v is None or isinstance(v, dict) for v in properties.values())
+
 
 class SQLiteGraphStore(GraphStore):
     """
@@ -24,18 +99,38 @@ class SQLiteGraphStore(GraphStore):
     - nodes: id (PK), labels (JSON), properties (JSON)
     - edges: source, target, relation, properties (JSON)
       Composite PK on (source, target, relation)
+
+    Writes are not committed one by one: they are coalesced and committed
+    every `commit_every` mutations or `flush_interval` seconds, whichever
+    comes first. Reads share the connection, so they always see pending
+    writes. Call `flush()` to force a commit; `close()` flushes.
     """
 
-    def __init__(self, db_path: str = "shadow_hunter.db"):
+    def __init__(self, db_path: str = "shadow_hunter.db",
+                 commit_every: int = 100, flush_interval: float = 0.2):
         self.db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        self._commit_every = commit_every
+        self._flush_interval = flush_interval
+        self._pending = 0
+        self._version = 0
+        self._flush_task: asyncio.Task | None = None
 
     async def initialize(self):
         """Create tables if they don't exist and open the connection."""
-        self._db = await aiosqlite.connect(self.db_path)
+        # Keep every hot-path statement prepared
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=256)
+        # Larger pages suit the JSON blobs; only applies to a brand-new file,
+        # so it must run before WAL mode is enabled and tables are created.
+        await self._db.execute("PRAGMA page_size=8192")
         # WAL mode for better concurrent read/write performance
         await self._db.execute("PRAGMA journal_mode=WAL")
         await self._db.execute("PRAGMA synchronous=NORMAL")
+        # Read-heavy tuning for get_all_* scans: memory-map up to 256 MB of
+        # the file, keep a 64 MB page cache and build temp b-trees in memory
+        await self._db.execute("PRAGMA mmap_size=268435456")
+        await self._db.execute("PRAGMA cache_size=-65536")
+        await self._db.execute("PRAGMA temp_store=MEMORY")
 
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS nodes (
@@ -60,79 +155,178 @@ class SQLiteGraphStore(GraphStore):
             CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target)
         """)
         await self._db.commit()
+        self._flush_task = asyncio.create_task(self._flush_loop())
         logger.info(f"📦 SQLite Graph Store initialized at {self.db_path}")
 
+    async def _flush_loop(self):
+        """Periodically commit writes that haven't hit the batch threshold."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"SQLite flush failed: {e}")
+
+    def get_version(self) -> int:
+        return self._version
+
+    async def _wrote(self):
+        """Record one mutation and commit once the batch is full."""
+        self._pending += 1
+        self._version += 1
+        if self._pending >= self._commit_every:
+            await self.flush()
+
+    async def _wrote_bulk(self, changed: int):
+        """Record a batch of `changed` row mutations and commit them.
+        Batches of no-op upserts leave the version (and cache keys) alone."""
+        if changed:
+            self._pending += changed
+            self._version += 1
+            await self.flush()
+
+    async def flush(self):
+        """Commit any pending writes."""
+        if self._pending:
+            self._pending = 0
+            await self._db.commit()
+
     async def add_node(self, node_id: str, labels: List[str], properties: Dict[str, Any]):
-        """Insert or update a node (upsert)."""
-        # Check if node exists for label merging
-        async with self._db.execute(
-            "SELECT labels, properties FROM nodes WHERE id = ?", (node_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
+        """Insert or update a node (upsert).
 
-        if row:
-            existing_labels = json.loads(row[0])
-            existing_props = json.loads(row[1])
-            merged_labels = list(set(existing_labels + labels))
-            existing_props.update(properties)
-            await self._db.execute(
-                "UPDATE nodes SET labels = ?, properties = ? WHERE id = ?",
-                (json.dumps(merged_labels), json.dumps(existing_props), node_id)
+        Usually runs as a single INSERT ... ON CONFLICT statement: labels are
+        unioned and properties are shallow-merged (dict.update semantics)
+        inside SQLite via JSON1, so there is no read-modify-write round trip.
+        """
+        if _patchable(properties):
+            cursor = await self._db.execute(
+                _NODE_UPSERT_SQL, (node_id, _dumps(labels), _dumps(properties))
             )
+            changed = cursor.rowcount
         else:
-            await self._db.execute(
-                "INSERT INTO nodes (id, labels, properties) VALUES (?, ?, ?)",
-                (node_id, json.dumps(labels), json.dumps(properties))
-            )
-        await self._db.commit()
+            changed = await self._merge_node(node_id, labels, properties)
+        if changed:
+            await self._wrote()
+
+    async def _merge_node(self, node_id: str, labels: List[str], properties: Dict[str, Any]) -> int:
+        """Read-merge-write upsert for properties json_patch can't merge exactly."""
+        async with self._db.execute(_NODE_SELECT_SQL, (node_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            merged = _loads(row[1])
+            merged.update(properties)
+            properties = merged
+            labels = sorted(set(_loads(row[0])).union(labels))
+        cursor = await self._db.execute(
+            _NODE_REPLACE_SQL, (node_id, _dumps(labels), _dumps(properties))
+        )
+        return cursor.rowcount
+
+    async def add_nodes_bulk(self, nodes: List[Tuple[str, List[str], Dict[str, Any]]]):
+        """Upsert many (node_id, labels, properties) rows in one transaction.
+
+        Rows are applied in input order, so later updates still win; runs of
+        json_patch-able rows share one executemany call.
+        """
+        changes = self._db.total_changes
+        for patchable, group in groupby(nodes, key=lambda n: _patchable(n[2])):
+            if patchable:
+                await self._db.executemany(
+                    _NODE_UPSERT_SQL,
+                    [(node_id, _dumps(labels), _dumps(props)) for node_id, labels, props in group]
+                )
+            else:
+                for node in group:
+                    await self._merge_node(*node)
+        await self._wrote_bulk(self._db.total_changes - changes)
 
     async def add_edge(self, source_id: str, target_id: str, relation_type: str, properties: Dict[str, Any]):
         """Insert or update an edge (upsert)."""
-        # Ensure both nodes exist
-        for nid in (source_id, target_id):
-            async with self._db.execute(
-                "SELECT 1 FROM nodes WHERE id = ?", (nid,)
-            ) as cursor:
-                if not await cursor.fetchone():
-                    await self.add_node(nid, ["Unknown"], {})
-
+        changes = self._db.total_changes
+        # Ensure both nodes exist (no-op for nodes already present)
+        await self._db.executemany(_ENSURE_NODE_SQL, [(source_id,), (target_id,)])
         await self._db.execute(
-            """INSERT INTO edges (source, target, relation, properties)
-               VALUES (?, ?, ?, ?)
-               ON CONFLICT(source, target, relation)
-               DO UPDATE SET properties = ?""",
-            (source_id, target_id, relation_type,
-             json.dumps(properties), json.dumps(properties))
+            _EDGE_UPSERT_SQL,
+            (source_id, target_id, relation_type, _dumps(properties))
         )
-        await self._db.commit()
+        if self._db.total_changes != changes:
+            await self._wrote()
 
-    async def get_all_nodes(self) -> List[Dict[str, Any]]:
-        """Retrieve all nodes."""
-        nodes = []
+    async def add_edges_bulk(self, edges: List[Tuple[str, str, str, Dict[str, Any]]]):
+        """Upsert many (source, target, relation, properties) rows in one
+        transaction, creating any missing endpoint nodes as "Unknown"."""
+        changes = self._db.total_changes
+        endpoints = dict.fromkeys(nid for e in edges for nid in (e[0], e[1]))
+        await self._db.executemany(_ENSURE_NODE_SQL, [(nid,) for nid in endpoints])
+        await self._db.executemany(
+            _EDGE_UPSERT_SQL,
+            [(src, dst, rel, _dumps(props)) for src, dst, rel, props in edges]
+        )
+        await self._wrote_bulk(self._db.total_changes - changes)
+
+    async def iter_all_nodes(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all nodes, decoding one row at a time."""
         async with self._db.execute("SELECT id, labels, properties FROM nodes") as cursor:
             async for row in cursor:
-                props = json.loads(row[2])
+                props = _loads(row[2])
                 props["id"] = row[0]
-                props["labels"] = json.loads(row[1])
-                nodes.append(props)
-        return nodes
+                props["labels"] = _loads(row[1])
+                yield props
 
-    async def get_all_edges(self) -> List[Dict[str, Any]]:
-        """Retrieve all edges."""
-        edges = []
+    async def iter_all_edges(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all edges, decoding one row at a time."""
         async with self._db.execute(
             "SELECT source, target, relation, properties FROM edges"
         ) as cursor:
             async for row in cursor:
-                props = json.loads(row[3])
+                props = _loads(row[3])
                 props["source"] = row[0]
                 props["target"] = row[1]
                 props["relation"] = row[2]
-                edges.append(props)
-        return edges
+                yield props
+
+    async def get_all_nodes(self) -> List[Dict[str, Any]]:
+        """Retrieve all nodes."""
+        return [node async for node in self.iter_all_nodes()]
+
+    async def get_all_edges(self) -> List[Dict[str, Any]]:
+        """Retrieve all edges."""
+        return [edge async for edge in self.iter_all_edges()]
+
+    # Aggregates run inside SQLite. Groups are ordered by first insertion
+    # (MIN(rowid)) so ties come out in the same order as a Python pass over
+    # get_all_* would produce.
+
+    async def count_nodes_by_type(self) -> Dict[str, int]:
+        """Node count per "type" property, grouped in SQL."""
+        async with self._db.execute("""
+            SELECT COALESCE(json_extract(properties, '$.type'), 'unknown') AS t, COUNT(*)
+            FROM nodes GROUP BY t ORDER BY MIN(rowid)
+        """) as cursor:
+            return {row[0]: row[1] async for row in cursor}
+
+    async def count_edges_by_protocol(self) -> Dict[str, int]:
+        """Edge count per "protocol" property, grouped in SQL."""
+        async with self._db.execute("""
+            SELECT COALESCE(json_extract(properties, '$.protocol'), 'unknown') AS p, COUNT(*)
+            FROM edges GROUP BY p ORDER BY MIN(rowid)
+        """) as cursor:
+            return {row[0]: row[1] async for row in cursor}
+
+    async def sum_bytes_by_target(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Top `limit` targets by summed "byte_count", aggregated in SQL."""
+        async with self._db.execute("""
+            SELECT target, SUM(COALESCE(json_extract(properties, '$.byte_count'), 0)) AS b
+            FROM edges GROUP BY target ORDER BY b DESC, MIN(rowid) LIMIT ?
+        """, (limit,)) as cursor:
+            return [(row[0], row[1]) async for row in cursor]
 
     async def close(self):
-        """Close the database connection."""
+        """Flush pending writes and close the database connection."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
         if self._db:
+            await self.flush()
             await self._db.close()
             logger.info("SQLite Graph Store closed.")
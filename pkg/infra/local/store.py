@@ -1,5 +1,7 @@
+import heapq
 import networkx as nx
-from typing import List, Dict, Any
+from collections import Counter
+from typing import List, Dict, Any, Tuple
 from pkg.core.interfaces import GraphStore
 from loguru import logger
 
@@ -10,13 +12,20 @@ class NetworkXStore(GraphStore):
     """
     def __init__(self):
         self.graph = nx.DiGraph()
+        self._version = 0
+
+    def get_version(self) -> int:
+        return self._version
 
     async def add_node(self, node_id: str, labels: List[str], properties: Dict[str, Any]):
+        self._version += 1
         # Merge properties if node exists
         if self.graph.has_node(node_id):
             current = self.graph.nodes[node_id]
             current.update(properties)
-            current["labels"] = list(set(current.get("labels", []) + labels))
+            merged = set(current.get("labels", ()))
+            merged.update(labels)
+            current["labels"] = sorted(merged)
         else:
             self.graph.add_node(node_id, labels=labels, **properties)
         
@@ -31,6 +40,7 @@ class NetworkXStore(GraphStore):
         # NetworkX multigraph support would be better for multiple edge types, 
         # but DiGraph is fine for MVP simple dependencies.
         self.graph.add_edge(source_id, target_id, relation=relation_type, **properties)
+        self._version += 1
         # logger.debug(f"Graph: Edge {source_id} -> {target_id}")
 
     async def get_all_nodes(self) -> List[Dict[str, Any]]:
@@ -44,3 +54,18 @@ class NetworkXStore(GraphStore):
         for u, v, attr in self.graph.edges(data=True):
             edges.append({"source": u, "target": v, **attr})
         return edges
+
+    async def count_nodes_by_type(self) -> Dict[str, int]:
+        return Counter(t for _, t in self.graph.nodes(data="type", default="unknown"))
+
+    async def count_edges_by_protocol(self) -> Dict[str, int]:
+        return Counter(p for _, _, p in self.graph.edges(data="protocol", default="unknown"))
+
+    async def sum_bytes_by_target(self, limit: int = 10) -> List[Tuple[str, int]]:
+        # The predecessor view already groups edges by target, so per-target
+        # totals stream straight into nlargest's bounded heap
+        totals = (
+            (v, sum(attr.get("byte_count", 0) for attr in preds.values()))
+            for v, preds in self.graph.pred.items() if preds
+        )
+        return heapq.nlargest(limit, totals, key=lambda x: x[1])
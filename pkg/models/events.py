@@ -23,6 +23,12 @@ class NetworkFlowEvent(BaseModel):
     payload_sample: Optional[str] = None # Base64 encoded or truncated text
     metadata: Dict[str, str] = Field(default_factory=dict)
 
+    @property
+    def host(self) -> Optional[str]:
+        """DPI hostname: HTTP Host, else TLS SNI, else DNS query."""
+        metadata = self.metadata
+        return metadata.get("host") or metadata.get("sni") or metadata.get("dns_query")
+
     class Config:
         populate_by_name = True
         json_encoders = {
@@ -18,6 +18,12 @@ try:
     SQLITE_AVAILABLE = True
 except ImportError:
     SQLITE_AVAILABLE = False
+try:
+    # Ships with uvicorn[standard] on Linux/macOS; not available on Windows
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 from services.analyzer.engine import AnalyzerEngine
 from services.listener.main import ListenerService
 from services.api.main import app as api_app, set_live_mode
@@ -38,13 +44,14 @@ async def main():
 
     if IN_MEMORY or not SQLITE_AVAILABLE:
         store = NetworkXStore()
+        await broker.start()
         logger.info("Using in-memory graph store (NetworkX)")
     else:
+        # Open the database (WAL recovery, schema setup) while the broker starts
         store = SQLiteGraphStore("shadow_hunter.db")
-        await store.initialize()
+        await asyncio.gather(broker.start(), store.initialize())
         logger.info("Using persistent graph store (SQLite)")
-    
-    await broker.start()
+
     set_graph_store(store)
     
     # 2. Initialize Services
@@ -101,12 +108,15 @@ async def main():
         if simulator_task:
             simulator_task.cancel()
         await broker.stop()
+        await analyzer.stop()
         if hasattr(store, 'close'):
             await store.close()
 
 if __name__ == "__main__":
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         pass
     except Exception as e:
@@ -19,10 +19,15 @@ Safety Guards:
    Ensure this aligns with your organization's Rules of Engagement.
 """
 import asyncio
+import heapq
+import re
 import time
+from collections import deque
 import ipaddress
 from typing import Dict, Optional, List
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from loguru import logger
 
 try:
@@ -31,8 +36,15 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+# HTTP/2 (httpx[http2]) lets the AI path burst multiplex over one connection
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
 
-@dataclass
+@dataclass(slots=True)
 class ProbeResult:
     """Result of an active interrogation probe."""
     target: str
@@ -64,6 +76,38 @@ AI_RESPONSE_INDICATORS = [
     "x-ratelimit-limit",    # Rate limiting headers
     "cf-ray",               # Cloudflare (many AI services use it)
 ]
+_AI_INDICATOR_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, AI_RESPONSE_INDICATORS)) + "))", re.IGNORECASE
+)
+
+# Keywords in an AI API's JSON body, matched case-insensitively on raw bytes.
+# The lookahead makes matches zero-width so overlapping keywords all count.
+AI_BODY_KEYWORDS = ["model", "gpt", "claude", "llama", "completion", "embedding", "token"]
+_AI_KEYWORD_RE = re.compile(
+    rb"(?=(" + b"|".join(kw.encode() for kw in AI_BODY_KEYWORDS) + rb"))", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def _is_internal_address(ip_or_host: str) -> bool:
+    """Classify a probe target once; hostnames skip ipaddress parsing entirely."""
+    if not ip_or_host[:1].isdigit() and ":" not in ip_or_host:
+        return False  # It's a hostname, not an IP — safe to probe
+    try:
+        addr = ipaddress.ip_address(ip_or_host)
+        return addr.is_private or addr.is_loopback or addr.is_reserved
+    except ValueError:
+        # It's a hostname, not an IP — safe to probe
+        return False
+
+
+_PROBE_OK = (True, "OK")
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Done-callback that marks an abandoned probe's exception as retrieved."""
+    if not task.cancelled():
+        task.exception()
 
 
 class ActiveProbe:
@@ -87,49 +131,90 @@ class ActiveProbe:
         self.timeout_seconds = timeout_seconds
 
         # Rate limiting state
-        self._probe_timestamps: List[float] = []
+        self._probe_timestamps: deque[float] = deque()  # oldest first
         self._cooldown_map: Dict[str, float] = {}  # target -> last_probe_time
-        self._probe_results: List[ProbeResult] = []
+        self._cooldown_heap: List[tuple[float, str]] = []  # (expiry, target)
+        # Recent results only (bounded memory); the lifetime count is kept separately
+        self._probe_results: deque[ProbeResult] = deque(maxlen=500)
+        self._total_probes = 0
+
+        # Shared HTTP client, created on first probe so its connection pool
+        # (and TLS sessions) is reused across probes to the same targets
+        self._client: Optional["httpx.AsyncClient"] = None
 
         if not HTTPX_AVAILABLE:
             logger.warning("⚠ httpx not installed — Active Interrogation disabled. Run: pip install httpx")
         elif self.enabled:
             logger.info(f"🔍 Active Interrogation armed (rate: {max_probes_per_minute}/min, cooldown: {cooldown_seconds}s)")
 
+    async def _get_client(self) -> "httpx.AsyncClient":
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                verify=False,  # Don't fail on self-signed certs
+                follow_redirects=True,
+                http2=H2_AVAILABLE,  # Falls back to HTTP/1.1 per ALPN
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _prune_rate_window(self):
+        """Drop probe timestamps that have left the 60s rate window."""
+        cutoff = time.time() - 60
+        timestamps = self._probe_timestamps
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
     def _is_rate_limited(self) -> bool:
         """Check if we've exceeded the probe rate limit."""
-        now = time.time()
-        # Clean old timestamps (older than 60s)
-        self._probe_timestamps = [t for t in self._probe_timestamps if now - t < 60]
+        self._prune_rate_window()
         return len(self._probe_timestamps) >= self.max_probes_per_minute
 
+    def _expire_cooldowns(self):
+        """Drop targets whose cooldown has elapsed, soonest expiry first."""
+        now = time.time()
+        heap = self._cooldown_heap
+        while heap and heap[0][0] <= now:
+            expiry, target = heapq.heappop(heap)
+            last_probe = self._cooldown_map.get(target)
+            # A re-probed target has a newer heap entry; keep it until that one
+            if last_probe is not None and last_probe + self.cooldown_seconds <= expiry:
+                del self._cooldown_map[target]
+
     def _is_on_cooldown(self, target: str) -> bool:
         """Check if a target is still on probe cooldown."""
-        last_probe = self._cooldown_map.get(target)
-        if last_probe is None:
-            return False
-        return (time.time() - last_probe) < self.cooldown_seconds
+        self._expire_cooldowns()
+        return target in self._cooldown_map
 
     def _is_internal_ip(self, ip_or_host: str) -> bool:
         """Safety guard: never probe internal/private IP addresses."""
-        try:
-            addr = ipaddress.ip_address(ip_or_host)
-            return addr.is_private or addr.is_loopback or addr.is_reserved
-        except ValueError:
-            # It's a hostname, not an IP — safe to probe
-            return False
+        return _is_internal_address(ip_or_host)
 
     def _can_probe(self, target: str) -> tuple[bool, str]:
         """Pre-flight checks before probing a target."""
         if not self.enabled:
             return False, "Active Interrogation is disabled"
-        if self._is_internal_ip(target):
+        if _is_internal_address(target):
             return False, f"Safety guard: {target} is an internal IP"
         if self._is_rate_limited():
             return False, "Rate limit exceeded"
         if self._is_on_cooldown(target):
             return False, f"Target {target} is on cooldown"
-        return True, "OK"
+        return _PROBE_OK
+
+    def _record_probe(self, target: str):
+        """Count a probe against the rate limit and start the target's cooldown."""
+        now = time.time()
+        self._probe_timestamps.append(now)
+        self._cooldown_map[target] = now
+        heapq.heappush(self._cooldown_heap, (now + self.cooldown_seconds, target))
 
     async def probe_http_options(self, target: str) -> ProbeResult:
         """
@@ -145,22 +230,20 @@ class ActiveProbe:
                 timestamp=time.time(), success=False, error=reason
             )
 
+        self._record_probe(target)
+        return await self._run_http_options(target)
+
+    async def _run_http_options(self, target: str) -> ProbeResult:
+        """OPTIONS probe body — caller is responsible for the pre-flight gate."""
         url = f"https://{target}"
-        self._probe_timestamps.append(time.time())
-        self._cooldown_map[target] = time.time()
 
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout_seconds,
-                verify=False,  # Don't fail on self-signed certs
-                follow_redirects=True,
-            ) as client:
-                response = await client.options(url)
+            client = await self._get_client()
+            response = await client.options(url)
 
-            # Analyze response headers
-            headers = dict(response.headers)
+            # Analyze response headers (httpx.Headers is case-insensitive)
+            headers = response.headers
             headers_of_interest = {}
-            ai_indicators = []
 
             server = headers.get("server", "")
             if server:
@@ -169,14 +252,16 @@ class ActiveProbe:
             # Check for API-like headers
             for key in ["x-request-id", "x-ratelimit-limit", "x-ratelimit-remaining",
                         "access-control-allow-methods", "access-control-allow-origin"]:
-                if key in headers:
-                    headers_of_interest[key] = headers[key]
+                val = headers.get(key)
+                if val is not None:
+                    headers_of_interest[key] = val
 
-            # Check for AI service indicators
-            all_headers_str = str(headers).lower()
-            for indicator in AI_RESPONSE_INDICATORS:
-                if indicator in all_headers_str:
-                    ai_indicators.append(indicator)
+            # Check for AI service indicators in any header name or value, in
+            # one regex pass; newlines (never inside a header) keep matches
+            # from spanning two fields
+            header_text = "\n".join(part for item in headers.items() for part in item)
+            found = {m.lower() for m in _AI_INDICATOR_RE.findall(header_text)}
+            ai_indicators = [ind for ind in AI_RESPONSE_INDICATORS if ind in found]
 
             is_ai = len(ai_indicators) >= 2  # Needs multiple indicators
 
@@ -192,16 +277,18 @@ class ActiveProbe:
                 headers_of_interest=headers_of_interest,
             )
             self._probe_results.append(result)
+            self._total_probes += 1
 
+            # Template + args: loguru only formats if a sink accepts the level
             logger.info(
-                f"🔍 Probe [{target}] OPTIONS → {response.status_code} "
-                f"(AI indicators: {len(ai_indicators)}, server: {server or 'hidden'})"
+                "🔍 Probe [{}] OPTIONS → {} (AI indicators: {}, server: {})",
+                target, response.status_code, len(ai_indicators), server or "hidden",
             )
             return result
 
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)[:100]}"
-            logger.debug(f"🔍 Probe [{target}] OPTIONS failed: {error_msg}")
+            logger.debug("🔍 Probe [{}] OPTIONS failed: {}", target, error_msg)
             return ProbeResult(
                 target=target, probe_type="http_options",
                 timestamp=time.time(), success=False, error=error_msg
@@ -211,7 +298,8 @@ class ActiveProbe:
         """
         Probe common AI API endpoints to confirm the destination is an AI service.
 
-        Sends lightweight GET requests to known API paths like /v1/models.
+        Sends lightweight HEAD requests to known API paths like /v1/models,
+        following up with a GET only where a JSON body needs inspecting.
         Does NOT send any data — read-only probing.
         """
         can_probe, reason = self._can_probe(target)
@@ -221,53 +309,55 @@ class ActiveProbe:
                 timestamp=time.time(), success=False, error=reason
             )
 
-        self._probe_timestamps.append(time.time())
-        self._cooldown_map[target] = time.time()
+        self._record_probe(target)
+        return await self._run_ai_endpoint(target)
 
+    async def _run_ai_endpoint(self, target: str) -> ProbeResult:
+        """AI endpoint probe body — caller is responsible for the pre-flight gate."""
         ai_indicators = []
         best_status = None
         headers_of_interest = {}
 
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout_seconds,
-                verify=False,
-                follow_redirects=True,
-            ) as client:
-                for path in AI_PROBE_PATHS:
-                    try:
-                        url = f"https://{target}{path}"
-                        response = await client.get(url)
-                        best_status = response.status_code
-
-                        # 401/403 on AI paths = API exists but needs auth
-                        if response.status_code in (401, 403):
-                            ai_indicators.append(f"auth_required:{path}")
-
-                        # 200 with JSON = likely an API
-                        elif response.status_code == 200:
-                            content_type = response.headers.get("content-type", "")
-                            if "json" in content_type:
-                                ai_indicators.append(f"json_api:{path}")
-                                # Check response body for AI keywords
-                                try:
-                                    body = response.text[:500].lower()
-                                    ai_keywords = ["model", "gpt", "claude", "llama",
-                                                   "completion", "embedding", "token"]
-                                    for kw in ai_keywords:
-                                        if kw in body:
-                                            ai_indicators.append(f"keyword:{kw}")
-                                except Exception:
-                                    pass
-
-                        # Capture interesting headers from any response
-                        for key in ["x-request-id", "x-ratelimit-limit", "server"]:
-                            val = response.headers.get(key)
-                            if val and key not in headers_of_interest:
-                                headers_of_interest[key] = val
-
-                    except Exception:
-                        continue  # Individual path failure is OK
+            client = await self._get_client()
+            # All paths are requested concurrently; results are folded in
+            # path order so indicators read the same as a sequential scan.
+            responses = await asyncio.gather(
+                *(self._fetch_path(client, f"https://{target}{path}") for path in AI_PROBE_PATHS),
+                return_exceptions=True,
+            )
+            for path, response in zip(AI_PROBE_PATHS, responses):
+                if isinstance(response, BaseException):
+                    continue  # Individual path failure is OK
+                try:
+                    best_status = response.status_code
+
+                    # 401/403 on AI paths = API exists but needs auth
+                    if response.status_code in (401, 403):
+                        ai_indicators.append(f"auth_required:{path}")
+
+                    # 200 with JSON = likely an API
+                    elif response.status_code == 200:
+                        content_type = response.headers.get("content-type", "")
+                        if "json" in content_type:
+                            ai_indicators.append(f"json_api:{path}")
+                            # Check response body for AI keywords
+                            try:
+                                found = {m.lower() for m in _AI_KEYWORD_RE.findall(response.content[:500])}
+                                for kw in AI_BODY_KEYWORDS:
+                                    if kw.encode() in found:
+                                        ai_indicators.append(f"keyword:{kw}")
+                            except Exception:
+                                pass
+
+                    # Capture interesting headers from any response
+                    for key in ["x-request-id", "x-ratelimit-limit", "server"]:
+                        val = response.headers.get(key)
+                        if val and key not in headers_of_interest:
+                            headers_of_interest[key] = val
+
+                except Exception:
+                    continue  # Individual path failure is OK
 
             is_ai = len(ai_indicators) >= 2
             result = ProbeResult(
@@ -281,22 +371,37 @@ class ActiveProbe:
                 headers_of_interest=headers_of_interest,
             )
             self._probe_results.append(result)
+            self._total_probes += 1
 
             logger.info(
-                f"🔍 Probe [{target}] AI endpoints → "
-                f"{'CONFIRMED AI' if is_ai else 'inconclusive'} "
-                f"(indicators: {ai_indicators})"
+                "🔍 Probe [{}] AI endpoints → {} (indicators: {})",
+                target, "CONFIRMED AI" if is_ai else "inconclusive", ai_indicators,
             )
             return result
 
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)[:100]}"
-            logger.debug(f"🔍 Probe [{target}] AI endpoints failed: {error_msg}")
+            logger.debug("🔍 Probe [{}] AI endpoints failed: {}", target, error_msg)
             return ProbeResult(
                 target=target, probe_type="ai_endpoint",
                 timestamp=time.time(), success=False, error=error_msg
             )
 
+    @staticmethod
+    async def _fetch_path(client: "httpx.AsyncClient", url: str) -> "httpx.Response":
+        """
+        HEAD an AI path, only GETting the body when it is worth reading.
+
+        Status and headers are all that matter except for a 200 JSON reply,
+        whose body is scanned for keywords. Servers that reject HEAD get a GET.
+        """
+        response = await client.head(url)
+        if response.status_code in (405, 501):
+            return await client.get(url)
+        if response.status_code == 200 and "json" in response.headers.get("content-type", ""):
+            return await client.get(url)
+        return response
+
     async def interrogate(self, target: str) -> Dict:
         """
         Full interrogation sequence: OPTIONS probe → AI endpoint probe.
@@ -305,8 +410,33 @@ class ActiveProbe:
         """
         results = {}
 
+        # One pre-flight gate for the whole sequence, so the AI probe isn't
+        # rejected by the cooldown the OPTIONS probe just started
+        can_probe, reason = self._can_probe(target)
+        if can_probe:
+            self._record_probe(target)
+            # Run both probes concurrently; the AI probe is cancelled if
+            # OPTIONS alone confirms the target
+            options_task = asyncio.create_task(self._run_http_options(target))
+            ai_task = asyncio.create_task(self._run_ai_endpoint(target))
+            try:
+                options_result = await options_task
+                if not options_result.is_ai_service:
+                    ai_result = await ai_task
+            finally:
+                # Whether OPTIONS confirmed the target, a probe raised or we
+                # were cancelled, leave no probe running without an owner
+                for task in (options_task, ai_task):
+                    if not task.done():
+                        task.cancel()
+                    task.add_done_callback(_retrieve_exception)
+        else:
+            options_result = ProbeResult(
+                target=target, probe_type="http_options",
+                timestamp=time.time(), success=False, error=reason
+            )
+
         # Step 1: HTTP OPTIONS (lightweight)
-        options_result = await self.probe_http_options(target)
         results["options_probe"] = {
             "success": options_result.success,
             "status_code": options_result.status_code,
@@ -316,7 +446,11 @@ class ActiveProbe:
 
         # Step 2: AI endpoint probing (if OPTIONS didn't already confirm)
         if not options_result.is_ai_service:
-            ai_result = await self.probe_ai_endpoint(target)
+            if not can_probe:
+                ai_result = ProbeResult(
+                    target=target, probe_type="ai_endpoint",
+                    timestamp=time.time(), success=False, error=reason
+                )
             results["ai_probe"] = {
                 "success": ai_result.success,
                 "status_code": ai_result.status_code,
@@ -328,27 +462,46 @@ class ActiveProbe:
             results["confirmed_ai"] = True
             results["ai_probe"] = {"skipped": True, "reason": "OPTIONS already confirmed AI"}
 
+        # False when the pre-flight gate refused the target and nothing was sent
+        results["probed"] = can_probe
         results["target"] = target
         results["timestamp"] = time.time()
 
         return results
 
+    async def interrogate_many(self, targets: List[str]) -> Dict[str, Dict]:
+        """
+        Interrogate several targets concurrently.
+
+        At most `max_probes_per_minute` interrogations are in flight at once;
+        the usual pre-flight gate still applies, so targets past the rate
+        limit come back with a rejected result. Returns target -> summary.
+        """
+        sem = asyncio.Semaphore(max(1, self.max_probes_per_minute))
+
+        async def one(target: str) -> Dict:
+            async with sem:
+                return await self.interrogate(target)
+
+        unique = list(dict.fromkeys(targets))
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(one(t)) for t in unique]
+        return {t: task.result() for t, task in zip(unique, tasks)}
+
     @property
     def recent_probes(self) -> List[ProbeResult]:
         """Get the last 50 probe results for dashboard display."""
-        return self._probe_results[-50:]
+        results = self._probe_results
+        return list(islice(results, max(0, len(results) - 50), None))
 
     @property
     def stats(self) -> Dict:
         """Probe system statistics."""
+        self._prune_rate_window()
+        self._expire_cooldowns()
         return {
-            "total_probes": len(self._probe_results),
-            "active_cooldowns": sum(
-                1 for t in self._cooldown_map.values()
-                if (time.time() - t) < self.cooldown_seconds
-            ),
-            "rate_window_count": len([
-                t for t in self._probe_timestamps if (time.time() - t) < 60
-            ]),
+            "total_probes": self._total_probes,
+            "active_cooldowns": len(self._cooldown_map),
+            "rate_window_count": len(self._probe_timestamps),
             "enabled": self.enabled,
         }
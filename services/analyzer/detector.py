@@ -13,6 +13,9 @@ from loguru import logger
 from pkg.models.events import NetworkFlowEvent
 from services.analyzer.plugin_base import DetectionPlugin
 
+_SEVERITY_RANK = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+_TOP_RANK = max(_SEVERITY_RANK.values())
+
 
 class AnomalyDetector:
     """
@@ -30,7 +33,11 @@ class AnomalyDetector:
             "255.255.255.255", "224.0.0.1", "224.0.0.2",
         }
         self.whitelist_prefixes = ["224.", "239.", "fe80:", "ff02:"]
-        self.whitelist_ports = {5353, 1900, 5228, 5229, 5230}
+        self.whitelist_ports = frozenset({5353, 1900, 5228, 5229, 5230})
+
+        # Tuples so str.startswith checks every prefix in one C-level call
+        self._known_subnets_tuple = tuple(self.known_subnets)
+        self._whitelist_prefixes_tuple = tuple(self.whitelist_prefixes)
 
         # Auto-load plugins
         self._load_plugins()
@@ -65,22 +72,18 @@ class AnomalyDetector:
         logger.info(f"Plugin system: {len(self.plugins)} detection plugins active")
 
     def is_internal(self, ip: str) -> bool:
-        return any(ip.startswith(prefix) for prefix in self.known_subnets)
+        return ip.startswith(self._known_subnets_tuple)
 
     def is_whitelisted(self, event: NetworkFlowEvent) -> bool:
         """Check if this traffic matches a known safe pattern."""
         dst = event.destination_ip
-
-        if dst in self.whitelist_ips:
-            return True
-        if any(dst.startswith(p) for p in self.whitelist_prefixes):
-            return True
-        if event.destination_port in self.whitelist_ports:
-            return True
-        if self.is_internal(event.source_ip) and self.is_internal(dst):
-            return True
-
-        return False
+        internal = self._known_subnets_tuple
+        return (
+            event.destination_port in self.whitelist_ports
+            or dst in self.whitelist_ips
+            or dst.startswith(self._whitelist_prefixes_tuple)
+            or (dst.startswith(internal) and event.source_ip.startswith(internal))
+        )
 
     def detect(self, event: NetworkFlowEvent) -> Tuple[bool, Optional[str]]:
         """
@@ -91,17 +94,19 @@ class AnomalyDetector:
         if self.is_whitelisted(event):
             return False, None
 
-        # Run all plugins, collect hits
-        severity_rank = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+        # Run plugins in load order, keeping the first highest-severity hit;
+        # nothing can outrank a HIGH, so stop at the first one
         best_hit = None
 
         for plugin in self.plugins:
             try:
                 is_anomalous, severity, reason = plugin.detect(event)
                 if is_anomalous and severity:
-                    rank = severity_rank.get(severity, 0)
+                    rank = _SEVERITY_RANK.get(severity, 0)
                     if best_hit is None or rank > best_hit[0]:
                         best_hit = (rank, severity, reason)
+                        if rank == _TOP_RANK:
+                            break
             except Exception as e:
                 logger.error(f"Plugin {plugin.name} error: {e}")
 
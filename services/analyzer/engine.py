@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import os
 import time
 from typing import Dict, Any
@@ -13,11 +14,19 @@ from services.active_defense.interrogator import ActiveProbe
 from services.graph.analytics import GraphAnalyzer
 from services.response.manager import ResponseManager
 from services.api.routers.policy import add_alert
+from services.api.transceiver import manager
 
 # Check if intelligence module models exist
 MODELS_DIR = os.path.join(os.path.dirname(__file__), "..", "intelligence", "saved_models")
 ML_AVAILABLE = os.path.exists(os.path.join(MODELS_DIR, "classifier_model.joblib"))
 
+# ML classification -> (min confidence, severity, alert reason) for flows the
+# rules didn't flag; anything else falls back to the anomaly score
+_ML_RULES = {
+    "shadow_ai": (0.7, "HIGH", "ML detected Shadow AI"),
+    "suspicious": (0.8, "MEDIUM", "ML flagged suspicious traffic"),
+}
+
 
 class AnalyzerEngine:
     """
@@ -28,9 +37,13 @@ class AnalyzerEngine:
     - ML-powered: IntelligenceEngine (when trained models are available)
 
     Performance:
-    - Graph writes use asyncio.gather for concurrent upserts.
+    - Graph writes are buffered and flushed as bulk upserts every
+      GRAPH_FLUSH_INTERVAL seconds or GRAPH_FLUSH_BATCH events.
     - Session context is injected into alerts for richer intelligence.
     """
+    GRAPH_FLUSH_INTERVAL = 0.05  # seconds
+    GRAPH_FLUSH_BATCH = 128      # events
+
     def __init__(self, broker: EventBroker, graph_store: GraphStore, use_ml: bool = True, active_defense: bool = True):
         self.broker = broker
         self.graph = graph_store
@@ -41,6 +54,19 @@ class AnalyzerEngine:
         self.graph_analyzer = GraphAnalyzer(graph_store)
         self.response_manager = ResponseManager(enabled=active_defense)
         self._event_count = 0
+        # Alert ids: a per-run prefix (so ids stay unique across restarts)
+        # plus a counter, instead of formatting the event's float timestamp
+        self._alert_id_prefix = f"alert-{int(time.time()):x}-"
+        self._alert_ids = itertools.count()
+
+        # Pending (src_id, src_props, dst_id, dst_props, edge_props) upserts
+        self._pending_upserts: list = []
+        self._flush_task: asyncio.Task | None = None
+
+        # Active probes run in the background so slow targets never stall
+        # event processing; results are pushed as "alert_update" messages
+        self._probe_sem = asyncio.Semaphore(16)
+        self._probe_tasks: set[asyncio.Task] = set()
 
         # ML Intelligence Engine (optional, enhances rule-based detection)
         self.intel_engine = None
@@ -56,16 +82,91 @@ class AnalyzerEngine:
     async def start(self):
         logger.info("Analyzer Engine starting...")
         await self.broker.subscribe("sh.telemetry.traffic.v1", self.handle_traffic_event)
+        self._flush_task = asyncio.create_task(self._graph_flush_loop())
         mode = "ML + Rules" if self.intel_engine else "Rules Only"
         logger.info(f"Analyzer subscribed ({mode}).")
 
+    async def stop(self):
+        """Flush buffered graph writes and release probe connections."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                # A flush interrupted mid-write requeues its batch before exiting
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush_graph()
+        for task in self._probe_tasks:
+            task.cancel()
+        await asyncio.gather(*self._probe_tasks, return_exceptions=True)
+        await self.active_probe.aclose()
+
+    async def _probe_and_amend(self, alert: Dict[str, Any], probe_target: str):
+        """Interrogate a target and attach the result to an already-sent alert."""
+        async with self._probe_sem:
+            try:
+                probe_result = await self.active_probe.interrogate(probe_target)
+            except Exception as e:
+                logger.debug(f"Active probe failed for {probe_target}: {e}")
+                return
+
+        # The alert dict is the one held by the alert store, so this also
+        # updates what /alerts returns
+        alert["active_probe"] = probe_result
+        if probe_result.get("confirmed_ai"):
+            alert["description"] += " [Active probe CONFIRMED AI service]"
+
+        # A probe refused for cooldown/rate limit learned nothing worth pushing
+        if probe_result.get("probed") and manager.has_listeners():
+            await manager.broadcast({
+                "type": "alert_update",
+                "payload": {
+                    "id": alert["id"],
+                    "description": alert["description"],
+                    "active_probe": probe_result,
+                }
+            })
+
+    async def _graph_flush_loop(self):
+        """Periodically write buffered upserts that haven't filled a batch."""
+        while True:
+            await asyncio.sleep(self.GRAPH_FLUSH_INTERVAL)
+            try:
+                await self.flush_graph()
+            except Exception as e:
+                logger.error(f"Graph flush failed: {e}")
+
+    async def flush_graph(self):
+        """Write all buffered node/edge upserts as one bulk batch, in order."""
+        if not self._pending_upserts:
+            return
+        batch, self._pending_upserts = self._pending_upserts, []
+        nodes = []
+        edges = []
+        for src_id, src_props, dst_id, dst_props, edge_props in batch:
+            nodes.append((src_id, ["Node"], src_props))
+            nodes.append((dst_id, ["Node"], dst_props))
+            edges.append((src_id, dst_id, "TALKS_TO", edge_props))
+        try:
+            await self.graph.add_nodes_bulk(nodes)
+            await self.graph.add_edges_bulk(edges)
+        except BaseException:
+            # Failed or cancelled mid-write: requeue ahead of anything buffered
+            # since, so the next flush retries (upserts are idempotent)
+            self._pending_upserts[:0] = batch
+            raise
+
     async def handle_traffic_event(self, event_data: Any):
         try:
             # 1. Parse Event
-            if isinstance(event_data, dict):
-                event = NetworkFlowEvent(**event_data)
-            elif isinstance(event_data, NetworkFlowEvent):
+            if isinstance(event_data, NetworkFlowEvent):
                 event = event_data
+            elif isinstance(event_data, (bytes, str)):
+                # Raw JSON (Kafka): pydantic parses and validates in one pass
+                event = NetworkFlowEvent.model_validate_json(event_data)
+            elif isinstance(event_data, dict):
+                event = NetworkFlowEvent.model_validate(event_data)
             else:
                 logger.error(f"Unknown event data type: {type(event_data)}")
                 return
@@ -75,14 +176,15 @@ class AnalyzerEngine:
                 logger.info(f"Analyzer processed {self._event_count} events")
 
             # 2. Enrich & Classify Nodes
-            host = event.metadata.get("host") or event.metadata.get("sni") or event.metadata.get("dns_query")
+            host = event.host
+            ts_iso = event.timestamp.isoformat()  # shared by node/edge props and alerts
 
             src_id = event.source_ip
             src_type = "internal" if self.detector.is_internal(src_id) else "external"
             src_props = {
                 "label": src_id,
                 "type": src_type,
-                "last_seen": event.timestamp.isoformat()
+                "last_seen": ts_iso
             }
 
             dst_id = event.destination_ip
@@ -103,22 +205,20 @@ class AnalyzerEngine:
             dst_props = {
                 "label": dst_label,
                 "type": dst_type,
-                "last_seen": event.timestamp.isoformat()
+                "last_seen": ts_iso
             }
 
-            # 3. Update Graph — concurrent upserts for performance
+            # 3. Update Graph — buffered, flushed as bulk upserts
             protocol_str = event.protocol.value if hasattr(event.protocol, 'value') else str(event.protocol)
             edge_props = {
                 "protocol": protocol_str,
                 "dst_port": event.destination_port,
                 "byte_count": event.bytes_sent + event.bytes_received,
-                "last_seen": event.timestamp.isoformat()
+                "last_seen": ts_iso
             }
-            await asyncio.gather(
-                self.graph.add_node(src_id, ["Node"], src_props),
-                self.graph.add_node(dst_id, ["Node"], dst_props),
-            )
-            await self.graph.add_edge(src_id, dst_id, "TALKS_TO", edge_props)
+            self._pending_upserts.append((src_id, src_props, dst_id, dst_props, edge_props))
+            if len(self._pending_upserts) >= self.GRAPH_FLUSH_BATCH:
+                await self.flush_graph()
 
             # 4. Detection — Rule-based (always runs)
             is_anomalous, reason = self.detector.detect(event)
@@ -130,30 +230,29 @@ class AnalyzerEngine:
                 ml_verdict = self.intel_engine.analyze(event)
 
                 # ML can override or enhance the rule-based verdict
-                if not is_anomalous and ml_verdict["classification"] == "shadow_ai" and ml_verdict["confidence"] > 0.7:
-                    is_anomalous = True
-                    reason = f"ML detected Shadow AI ({ml_verdict['confidence']:.0%} confidence)"
-                    severity = "HIGH"
-                elif not is_anomalous and ml_verdict["classification"] == "suspicious" and ml_verdict["confidence"] > 0.8:
-                    is_anomalous = True
-                    reason = f"ML flagged suspicious traffic ({ml_verdict['confidence']:.0%} confidence)"
-                    severity = "MEDIUM"
-                elif not is_anomalous and ml_verdict["is_anomalous"]:
-                    is_anomalous = True
-                    reason = f"Anomaly detected (score: {ml_verdict['anomaly_score']:.2f})"
-                    severity = "LOW"
+                if not is_anomalous:
+                    confidence = ml_verdict["confidence"]
+                    rule = _ML_RULES.get(ml_verdict["classification"])
+                    if rule and confidence > rule[0]:
+                        is_anomalous = True
+                        _, severity, label = rule
+                        reason = f"{label} ({confidence:.0%} confidence)"
+                    elif ml_verdict["is_anomalous"]:
+                        is_anomalous = True
+                        reason = f"Anomaly detected (score: {ml_verdict['anomaly_score']:.2f})"
+                        severity = "LOW"
 
             # 6. Generate Alert
             if is_anomalous:
                 logger.warning(f"🚨 ALERT [{severity}]: {src_id} -> {dst_id} ({reason})")
 
                 alert = {
-                    "id": f"alert-{event.timestamp.timestamp()}-{self._event_count}",
+                    "id": f"{self._alert_id_prefix}{next(self._alert_ids):x}",
                     "severity": severity,
                     "description": reason,
                     "source": src_id,
                     "target": dst_label,
-                    "timestamp": event.timestamp.isoformat(),
+                    "timestamp": ts_iso,
                     "protocol": protocol_str,
                     "source_port": event.source_port,
                     "destination_port": event.destination_port,
@@ -218,23 +317,20 @@ class AnalyzerEngine:
                             alert["description"] += f" [Session risk: {session_ctx['risk_score']:.0%}]"
 
                 # Active Interrogation — probe CRITICAL/HIGH external targets
+                # in the background; the result follows as an alert_update
                 if severity in ("CRITICAL", "HIGH") and self.active_probe.enabled:
                     probe_target = host or event.destination_ip
                     if probe_target and not self.detector.is_internal(event.destination_ip):
-                        try:
-                            probe_result = await self.active_probe.interrogate(probe_target)
-                            alert["active_probe"] = probe_result
-                            if probe_result.get("confirmed_ai"):
-                                alert["description"] += " [Active probe CONFIRMED AI service]"
-                        except Exception as e:
-                            logger.debug(f"Active probe failed for {probe_target}: {e}")
+                        task = asyncio.create_task(self._probe_and_amend(alert, probe_target))
+                        self._probe_tasks.add(task)
+                        task.add_done_callback(self._probe_tasks.discard)
 
                 # Broadcast to connected clients
-                from services.api.transceiver import manager
-                await manager.broadcast({
-                    "type": "alert",
-                    "payload": alert
-                })
+                if manager.has_listeners():
+                    await manager.broadcast({
+                        "type": "alert",
+                        "payload": alert
+                    })
 
                 add_alert(alert)
 
@@ -248,16 +344,16 @@ class AnalyzerEngine:
                     )
                     if block_result.get("blocked"):
                         alert["auto_response"] = block_result
-                        from services.api.transceiver import manager
-                        await manager.broadcast({
-                            "type": "auto_response",
-                            "payload": {
-                                "action": "BLOCK",
-                                "ip": event.source_ip,
-                                "reason": reason,
-                                "alert_id": alert["id"],
-                            }
-                        })
+                        if manager.has_listeners():
+                            await manager.broadcast({
+                                "type": "auto_response",
+                                "payload": {
+                                    "action": "BLOCK",
+                                    "ip": event.source_ip,
+                                    "reason": reason,
+                                    "alert_id": alert["id"],
+                                }
+                            })
 
             # 7. Periodic Graph Analytics — lateral movement detection
             if self.graph_analyzer.should_analyze():
@@ -270,7 +366,7 @@ class AnalyzerEngine:
                             "description": ba.risk_assessment,
                             "source": ba.node_id,
                             "target": ", ".join(ba.connected_to[:5]),
-                            "timestamp": event.timestamp.isoformat(),
+                            "timestamp": ts_iso,
                             "matched_rule": "Graph Centrality Analysis",
                             "graph_centrality": {
                                 "centrality_score": ba.centrality_score,
@@ -279,11 +375,11 @@ class AnalyzerEngine:
                                 "connected_to": ba.connected_to,
                             }
                         }
-                        from services.api.transceiver import manager
-                        await manager.broadcast({
-                            "type": "alert",
-                            "payload": graph_alert
-                        })
+                        if manager.has_listeners():
+                            await manager.broadcast({
+                                "type": "alert",
+                                "payload": graph_alert
+                            })
                         add_alert(graph_alert)
                 except Exception as e:
                     logger.debug(f"Graph analytics error: {e}")
@@ -46,6 +46,7 @@ async def main():
         pass
     finally:
         await broker.stop()
+        await engine.stop()
         if hasattr(store, 'close'):
             await store.close()
         logger.info("Analyzer Service stopped")
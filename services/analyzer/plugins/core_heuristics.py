@@ -20,9 +20,7 @@ class AIDomainDetector(DetectionPlugin):
     description = "Flags traffic to known AI services (ChatGPT, Claude, Gemini, etc.)"
 
     def detect(self, event: NetworkFlowEvent) -> Tuple[bool, Optional[str], Optional[str]]:
-        host = (event.metadata.get("host")
-                or event.metadata.get("sni")
-                or event.metadata.get("dns_query"))
+        host = event.host
 
         if host:
             category = get_ai_category(host)
@@ -39,11 +37,11 @@ class UnusualPortDetector(DetectionPlugin):
     description = "Flags internal→external traffic on non-standard ports"
 
     KNOWN_PORTS = {80, 443, 8080, 53, 8443, 993, 995, 587, 465, 22, 3389}
-    INTERNAL_PREFIXES = ["192.168.", "10.0.", "172.16.", "127.0."]
+    INTERNAL_PREFIXES = ("192.168.", "10.0.", "172.16.", "127.0.")  # tuple: one startswith call
 
     def detect(self, event: NetworkFlowEvent) -> Tuple[bool, Optional[str], Optional[str]]:
-        src_internal = any(event.source_ip.startswith(p) for p in self.INTERNAL_PREFIXES)
-        dst_internal = any(event.destination_ip.startswith(p) for p in self.INTERNAL_PREFIXES)
+        src_internal = event.source_ip.startswith(self.INTERNAL_PREFIXES)
+        dst_internal = event.destination_ip.startswith(self.INTERNAL_PREFIXES)
 
         if src_internal and not dst_internal:
             if event.destination_port not in self.KNOWN_PORTS:
@@ -72,12 +70,12 @@ class DataExfiltrationDetector(DetectionPlugin):
     name = "Data Exfiltration Detector"
     description = "Flags unusually large outbound data transfers to external hosts"
 
-    INTERNAL_PREFIXES = ["192.168.", "10.0.", "172.16.", "127.0."]
+    INTERNAL_PREFIXES = ("192.168.", "10.0.", "172.16.", "127.0.")  # tuple: one startswith call
     EXFIL_THRESHOLD = 500000  # 500KB in a single flow
 
     def detect(self, event: NetworkFlowEvent) -> Tuple[bool, Optional[str], Optional[str]]:
-        src_internal = any(event.source_ip.startswith(p) for p in self.INTERNAL_PREFIXES)
-        dst_internal = any(event.destination_ip.startswith(p) for p in self.INTERNAL_PREFIXES)
+        src_internal = event.source_ip.startswith(self.INTERNAL_PREFIXES)
+        dst_internal = event.destination_ip.startswith(self.INTERNAL_PREFIXES)
 
         if src_internal and not dst_internal and event.bytes_sent > self.EXFIL_THRESHOLD:
             size_kb = event.bytes_sent / 1024
@@ -43,7 +43,7 @@ class JA3FingerprintPlugin(DetectionPlugin):
             match = self.matcher.lookup(ja3_hash)
             reason = (
                 f"🔴 ATTACK TOOL DETECTED: {match.client_name} "
-                f"(JA3: {ja3_hash[:12]}...) — {match.description}"
+                f"(JA3: {match.short_hash}) — {match.description}"
             )
             return True, "CRITICAL", reason
 
@@ -62,7 +62,7 @@ class JA3FingerprintPlugin(DetectionPlugin):
         if match and match.category in ("scripting", "bot", "proxy"):
             reason = (
                 f"🔍 Non-browser client: {match.client_name} "
-                f"[{match.category}] (JA3: {ja3_hash[:12]}...)"
+                f"[{match.category}] (JA3: {match.short_hash})"
             )
             return True, "MEDIUM", reason
 
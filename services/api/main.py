@@ -45,12 +45,14 @@ app.include_router(policy.router, prefix="/v1/policy", tags=["Policy"])
 # ── API Key Authentication Middleware ──
 # Protects write operations. Read endpoints remain open.
 API_KEY = os.environ.get("SH_API_KEY", "shadow-hunter-dev")
-OPEN_PATHS = {"/health", "/ws", "/docs", "/openapi.json", "/redoc"}
+OPEN_PATHS = frozenset({"/health", "/ws", "/docs", "/openapi.json", "/redoc"})
 
 @app.middleware("http")
 async def api_key_auth(request: Request, call_next):
     # Allow all GET requests and open paths
-    if request.method == "GET" or request.url.path in OPEN_PATHS:
+    # Raw ASGI scope values: no URL object is built just to read the path
+    scope = request.scope
+    if scope["method"] == "GET" or scope["path"] in OPEN_PATHS:
         return await call_next(request)
 
     # Require API key for write operations
@@ -1,26 +1,70 @@
-from fastapi import APIRouter, Depends
-from typing import List, Dict, Any
-from collections import Counter
+import asyncio
+import heapq
+import time
+from fastapi import APIRouter, Depends, Request, Response
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
+from collections import Counter, defaultdict
 from services.api.dependencies import get_graph_store
-from services.api.routers.policy import get_alerts_store
+from services.api.routers.policy import get_alerts_store, get_alerts_version, get_ip_aggregates, get_ip_first_seen
 from pkg.core.interfaces import GraphStore
 
 router = APIRouter()
 
+# Responses and graph snapshots are reused while the alert and graph versions
+# they were computed from are unchanged. Stores that can't report a version
+# are only trusted for CACHE_TTL seconds. One lock per entry coalesces
+# concurrent requests into a single fetch.
+CACHE_TTL = 2.0
+_cache: Dict[str, Tuple[float, tuple, Any]] = {}
+_cache_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Distinguishes ETags across restarts, since version counters start from zero
+_ETAG_EPOCH = f"{int(time.time()):x}"
+
+
+async def _cached(name: str, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached result for `name` if `key` still matches, else recompute."""
+    async with _cache_locks[name]:
+        entry = _cache.get(name)
+        now = time.monotonic()
+        if entry and entry[1] == key and (None not in key or now - entry[0] < CACHE_TTL):
+            return entry[2]
+        result = await compute()
+        _cache[name] = (now, key, result)
+        return result
+
+
+def _etag(name: str, store: GraphStore) -> Optional[str]:
+    version = store.get_version()
+    return None if version is None else f'W/"{name}-{_ETAG_EPOCH}-{version:x}"'
+
+
 @router.get("/nodes")
-async def get_nodes(store: GraphStore = Depends(get_graph_store)):
+async def get_nodes(request: Request, response: Response,
+                    store: GraphStore = Depends(get_graph_store)):
     """
     Retrieve all discovered nodes from the GraphStore.
     """
-    nodes = await store.get_all_nodes()
+    etag = _etag("nodes", store)
+    if etag:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    nodes = await _cached("nodes", (id(store), store.get_version()), store.get_all_nodes)
     return nodes
 
 @router.get("/edges")
-async def get_edges(store: GraphStore = Depends(get_graph_store)):
+async def get_edges(request: Request, response: Response,
+                    store: GraphStore = Depends(get_graph_store)):
     """
     Retrieve all discovered dependencies from the GraphStore.
     """
-    edges = await store.get_all_edges()
+    etag = _etag("edges", store)
+    if etag:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    edges = await _cached("edges", (id(store), store.get_version()), store.get_all_edges)
     return edges
 
 @router.get("/risk-scores")
@@ -29,34 +73,25 @@ async def get_risk_scores(store: GraphStore = Depends(get_graph_store)):
     Calculate risk scores per internal IP based on alert frequency and severity.
     Returns sorted list: highest risk first.
     """
-    alerts = get_alerts_store()
-    
-    # Count alerts per source IP with severity weighting
-    SEVERITY_WEIGHTS = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
-    ip_scores: Dict[str, dict] = {}
-    
-    for alert in alerts:
-        src = alert.get("source", "unknown")
-        sev = alert.get("severity", "LOW")
-        weight = SEVERITY_WEIGHTS.get(sev, 1)
-        
-        if src not in ip_scores:
-            ip_scores[src] = {"ip": src, "total_alerts": 0, "weighted_score": 0, "high": 0, "medium": 0, "low": 0, "last_alert": ""}
-        
-        ip_scores[src]["total_alerts"] += 1
-        ip_scores[src]["weighted_score"] += weight
-        ip_scores[src][sev.lower()] = ip_scores[src].get(sev.lower(), 0) + 1
-        ip_scores[src]["last_alert"] = alert.get("timestamp", "")
-    
-    # Normalize scores to 0-100
-    if ip_scores:
-        max_score = max(v["weighted_score"] for v in ip_scores.values()) or 1
-        for v in ip_scores.values():
-            v["risk_pct"] = round((v["weighted_score"] / max_score) * 100)
-    
-    # Sort by weighted score descending
-    result = sorted(ip_scores.values(), key=lambda x: x["weighted_score"], reverse=True)
-    return result[:20]  # Top 20 offenders
+    return await _cached("risk-scores", (get_alerts_version(),), _compute_risk_scores)
+
+async def _compute_risk_scores() -> List[dict]:
+    # Per-source tallies are maintained as alerts arrive, so this only ranks them
+    ip_scores = get_ip_aggregates()
+    if not ip_scores:
+        return []
+
+    # Top 20 offenders, highest weighted score first (ties in order of each
+    # source's first alert still in the store), normalized to 0-100
+    max_score = max(v["weighted_score"] for v in ip_scores.values()) or 1
+    top = heapq.nsmallest(
+        20, ip_scores.values(),
+        key=lambda x: (-x["weighted_score"], get_ip_first_seen(x["ip"])),
+    )
+    return [
+        {**v, "risk_pct": round((v["weighted_score"] / max_score) * 100)}
+        for v in top
+    ]
 
 @router.get("/traffic-stats")
 async def get_traffic_stats(store: GraphStore = Depends(get_graph_store)):
@@ -64,48 +99,30 @@ async def get_traffic_stats(store: GraphStore = Depends(get_graph_store)):
     Traffic statistics for dashboard visualization.
     Returns protocol breakdown, traffic classification, and time-series data.
     """
-    from collections import Counter, defaultdict
-    from datetime import datetime
-    
-    edges = await store.get_all_edges()
-    nodes = await store.get_all_nodes()
+    key = (get_alerts_version(), id(store), store.get_version())
+    return await _cached("traffic-stats", key, lambda: _compute_traffic_stats(store))
+
+async def _compute_traffic_stats(store: GraphStore) -> Dict[str, Any]:
+    # Aggregation runs in the store, so the full node/edge lists never load
+    protocol_counts, type_counts, top_destinations = await asyncio.gather(
+        store.count_edges_by_protocol(),
+        store.count_nodes_by_type(),
+        store.sum_bytes_by_target(limit=10),
+    )
     alerts = get_alerts_store()
     
-    # Protocol distribution
-    protocol_counts = Counter(e.get("protocol", "unknown") for e in edges)
-    
-    # Node type distribution  
-    type_counts = Counter(n.get("type", "unknown") for n in nodes)
-    
-    # Traffic classification from alerts
-    total_events = len(edges)
-    shadow_count = type_counts.get("shadow", 0)
-    
     # Alert severity distribution
     severity_counts = Counter(a.get("severity", "LOW") for a in alerts)
     
-    # Bytes distribution (top destinations by traffic volume)
-    dst_bytes = defaultdict(int)
-    for e in edges:
-        target = e.get("target", "unknown")
-        byte_count = e.get("byte_count", 0)
-        dst_bytes[target] += byte_count
-    top_destinations = sorted(dst_bytes.items(), key=lambda x: x[1], reverse=True)[:10]
-    
-    # Traffic comparison: AI vs Normal
-    ai_traffic_count = sum(1 for n in nodes if n.get("type") == "shadow")
-    normal_traffic_count = sum(1 for n in nodes if n.get("type") == "external")
-    internal_count = sum(1 for n in nodes if n.get("type") == "internal")
-    
     return {
         "protocol_distribution": [
             {"name": proto, "value": count}
-            for proto, count in protocol_counts.most_common()
+            for proto, count in sorted(protocol_counts.items(), key=lambda x: x[1], reverse=True)
         ],
         "node_types": {
-            "internal": internal_count,
-            "external": normal_traffic_count,
-            "shadow_ai": ai_traffic_count,
+            "internal": type_counts.get("internal", 0),
+            "external": type_counts.get("external", 0),
+            "shadow_ai": type_counts.get("shadow", 0),
         },
         "severity_distribution": {
             "HIGH": severity_counts.get("HIGH", 0),
@@ -117,8 +134,8 @@ async def get_traffic_stats(store: GraphStore = Depends(get_graph_store)):
             for dst, bts in top_destinations
         ],
         "totals": {
-            "total_nodes": len(nodes),
-            "total_connections": len(edges),
+            "total_nodes": sum(type_counts.values()),
+            "total_connections": sum(protocol_counts.values()),
             "total_alerts": len(alerts),
         }
     }
@@ -1,12 +1,25 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Deque, Dict, List, Optional
+from collections import deque
 import uuid
 
 router = APIRouter()
 
-# In-memory alert store (shared across the app)
-_alerts_store: List[dict] = []
+# In-memory alert store (shared across the app): the last 100 alerts, oldest
+# evicted automatically on append
+_alerts_store: Deque[dict] = deque(maxlen=100)
+# Bumped on every append so readers can tell when the store has changed
+_alerts_version = 0
+
+# Per-source risk tallies over the alerts currently in _alerts_store, shaped
+# like /discovery/risk-scores rows and kept in step on every append/evict.
+# Severity -> (weight, count key); anything else weighs 1 under its own name.
+_SEV_IDX = {"HIGH": (3, "high"), "MEDIUM": (2, "medium"), "LOW": (1, "low")}
+_ip_aggregates: Dict[str, dict] = {}
+# Per-source sequence numbers of its alerts still in the window, oldest first;
+# the head gives each source's first-seen rank for ordering tied scores
+_ip_alert_seqs: Dict[str, Deque[int]] = {}
 
 # ── Policy Rules Store ──
 _policy_rules: List[dict] = [
@@ -52,12 +65,41 @@ _policy_rules: List[dict] = [
     },
 ]
 
+def _tally(alert: dict, sign: int):
+    """Add (sign=1) or remove (sign=-1) one alert from the per-source tallies."""
+    src = alert.get("source", "unknown")
+    sev = alert.get("severity", "LOW")
+    weight, key = _SEV_IDX.get(sev) or (1, sev.lower())
+    agg = _ip_aggregates.get(src)
+    if agg is None:
+        agg = _ip_aggregates[src] = {"ip": src, "total_alerts": 0, "weighted_score": 0,
+                                     "high": 0, "medium": 0, "low": 0, "last_alert": ""}
+    agg["total_alerts"] += sign
+    if sign > 0:
+        _ip_alert_seqs.setdefault(src, deque()).append(_alerts_version)
+    else:
+        # Eviction is FIFO, so the evicted alert is this source's oldest
+        _ip_alert_seqs[src].popleft()
+    if not agg["total_alerts"]:
+        # Its last alert in the window was evicted
+        del _ip_aggregates[src]
+        del _ip_alert_seqs[src]
+        return
+    agg["weighted_score"] += sign * weight
+    agg[key] = agg.get(key, 0) + sign
+    if not agg[key] and key not in ("high", "medium", "low"):
+        del agg[key]
+    if sign > 0:
+        agg["last_alert"] = alert.get("timestamp", "")
+
 def add_alert(alert: dict):
     """Called by the analyzer to push alerts."""
+    global _alerts_version
+    if len(_alerts_store) == _alerts_store.maxlen:
+        _tally(_alerts_store[0], -1)
     _alerts_store.append(alert)
-    # Keep last 100 alerts
-    if len(_alerts_store) > 100:
-        _alerts_store.pop(0)
+    _tally(alert, 1)
+    _alerts_version += 1
 
 def check_policy(service: str, source: str) -> Optional[dict]:
     """Check if any enabled policy rule matches the given service."""
@@ -67,15 +109,26 @@ def check_policy(service: str, source: str) -> Optional[dict]:
             return rule
     return None
 
-def get_alerts_store() -> List[dict]:
+def get_alerts_store() -> Deque[dict]:
     return _alerts_store
 
+def get_alerts_version() -> int:
+    return _alerts_version
+
+def get_ip_aggregates() -> Dict[str, dict]:
+    """Live per-source alert tallies; callers must not mutate the rows."""
+    return _ip_aggregates
+
+def get_ip_first_seen(ip: str) -> int:
+    """Rank of the source's oldest alert still in the store (lower = earlier)."""
+    return _ip_alert_seqs[ip][0]
+
 @router.get("/alerts")
 async def get_alerts():
     """
     Get active security alerts from the live store.
     """
-    return _alerts_store
+    return list(_alerts_store)
 
 @router.post("/scan")
 async def trigger_scan():
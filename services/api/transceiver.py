@@ -1,8 +1,26 @@
+import asyncio
 from fastapi import WebSocket
 from typing import List
 import json
 from loguru import logger
 
+
+def _default(obj):
+    """Serialize NumPy scalars (e.g. ML confidences) as plain Python values."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson is optional: much faster for the alert payloads broadcast below
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=_default).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=_default)
+
 class ConnectionManager:
     """
     Manages active WebSocket connections for real-time updates.
@@ -20,6 +38,10 @@ class ConnectionManager:
             self.active_connections.remove(websocket)
             logger.info(f"WebSocket client disconnected. Total clients: {len(self.active_connections)}")
 
+    def has_listeners(self) -> bool:
+        """True if any client is connected; lets callers skip building messages."""
+        return bool(self.active_connections)
+
     async def broadcast(self, message: dict):
         """
         Broadcast a JSON message to all connected clients.
@@ -28,18 +50,20 @@ class ConnectionManager:
         if not self.active_connections:
             return
 
-        payload = json.dumps(message)
-        cleanup_list = []
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(payload)
-            except Exception as e:
-                logger.warning(f"Failed to send to client, removing: {e}")
-                cleanup_list.append(connection)
-        
-        for dead_ws in cleanup_list:
-            self.disconnect(dead_ws)
+        payload = _dumps(message)
+
+        # Send to every client concurrently, so one slow socket doesn't hold
+        # up the rest (or the analyzer awaiting this broadcast)
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True,
+        )
+
+        for dead_ws, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to client, removing: {result}")
+                self.disconnect(dead_ws)
 
 # Global instance
 manager = ConnectionManager()
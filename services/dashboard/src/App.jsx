@@ -178,6 +178,10 @@ function App() {
         if (msg.type === "alert") {
           console.log("⚡ Real-time alert received");
           fetchStats(); // Instant refresh
+        } else if (msg.type === "alert_update") {
+          // Background active-probe result amended onto an existing alert
+          console.log(`🔍 Probe result for ${msg.payload.id}`);
+          fetchStats();
         }
       };
 
@@ -19,6 +19,7 @@ References:
     - MITRE ATT&CK TA0008 (Lateral Movement)
     - Freeman, L.C. (1977) "A Set of Measures of Centrality Based on Betweenness"
 """
+import asyncio
 import time
 import networkx as nx
 from typing import Dict, List, Optional
@@ -116,24 +117,20 @@ class GraphAnalyzer:
                 # Not enough data for meaningful analysis
                 return alerts
 
-            # 2. Build NetworkX graph
+            # 2. Build NetworkX graph (bulk adds)
+            node_types = {node.get("id", ""): node.get("type", "unknown") for node in nodes}
             G = nx.DiGraph()
-            node_types = {}
-            for node in nodes:
-                node_id = node.get("id", "")
-                node_type = node.get("type", "unknown")
-                G.add_node(node_id)
-                node_types[node_id] = node_type
-
-            for edge in edges:
-                src = edge.get("source", "")
-                tgt = edge.get("target", "")
-                if src and tgt:
-                    G.add_edge(src, tgt)
-
-            # 3. Calculate Betweenness Centrality
+            G.add_nodes_from(node_types)
+            G.add_edges_from(
+                (src, tgt) for src, tgt in
+                ((edge.get("source", ""), edge.get("target", "")) for edge in edges)
+                if src and tgt
+            )
+
+            # 3. Calculate Betweenness Centrality — O(V·E), so run it in a
+            # worker thread to keep the event loop serving other events
             try:
-                centrality = nx.betweenness_centrality(G, normalized=True)
+                centrality = await asyncio.to_thread(nx.betweenness_centrality, G, normalized=True)
             except Exception as e:
                 logger.debug(f"Centrality calculation failed: {e}")
                 return alerts
@@ -154,11 +154,12 @@ class IntelligenceEngine:
             )
 
         return {
-            "is_anomalous": is_anomalous or ae_anomalous,
-            "anomaly_score": round(anomaly_score, 3),
-            "classification": classification,
-            "confidence": round(confidence, 3),
-            "risk_score": round(risk_score, 2),
+            # Plain Python types: NumPy scalars don't survive JSON encoding
+            "is_anomalous": bool(is_anomalous or ae_anomalous),
+            "anomaly_score": round(float(anomaly_score), 3),
+            "classification": str(classification),
+            "confidence": round(float(confidence), 3),
+            "risk_score": round(float(risk_score), 2),
             "reasons": reasons,
             "autoencoder": ae_result,
         }
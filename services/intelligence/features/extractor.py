@@ -66,10 +66,10 @@ class FeatureExtractor:
         "hour_of_day", "is_ai_port", "payload_size_bucket", "is_known_ai_cidr",
     ]
 
-    INTERNAL_PREFIXES = ["192.168.", "10.", "172.16.", "172.17.", "172.18.",
+    INTERNAL_PREFIXES = ("192.168.", "10.", "172.16.", "172.17.", "172.18.",
                          "172.19.", "172.20.", "172.21.", "172.22.", "172.23.",
                          "172.24.", "172.25.", "172.26.", "172.27.", "172.28.",
-                         "172.29.", "172.30.", "172.31.", "127."]
+                         "172.29.", "172.30.", "172.31.", "127.")
 
     # Shared CIDR matcher instance (singleton-like for efficiency)
     _cidr_matcher = CIDRMatcher()
@@ -107,7 +107,7 @@ class FeatureExtractor:
         return np.array([self.extract(e) for e in events], dtype=np.float32)
 
     def _is_internal(self, ip: str) -> bool:
-        return any(ip.startswith(p) for p in self.INTERNAL_PREFIXES)
+        return ip.startswith(self.INTERNAL_PREFIXES)
 
     def _is_well_known_port(self, port: int) -> bool:
         for ports in PORT_CATEGORIES.values():
@@ -0,0 +1,90 @@
+import asyncio
+
+from pkg.infra.local.sqlite_store import SQLiteGraphStore
+
+
+def _run(db_path, steps):
+    """Apply `steps(store)` to a fresh store and return its nodes by id."""
+    async def go():
+        store = SQLiteGraphStore(str(db_path))
+        await store.initialize()
+        try:
+            await steps(store)
+            return {n["id"]: n for n in await store.get_all_nodes()}
+        finally:
+            await store.close()
+    return asyncio.run(go())
+
+
+def test_update_merges_keys_that_are_not_valid_json_paths(tmp_path):
+    odd = {'k"ey': 1, "dotted.key": 2, "": 3, "$[0]": 4}
+
+    async def steps(store):
+        await store.add_node("b", ["Node"], {})
+        await store.add_node("b", ["Node"], odd)
+
+    node = _run(tmp_path / "g.db", steps)["b"]
+    for key, value in odd.items():
+        assert node[key] == value
+
+
+def test_update_matches_dict_update(tmp_path):
+    first = {"type": "internal", "flag": True, "tags": ["a"], "meta": {"x": 1}, "gone": None}
+    second = {"flag": False, "k\"q": 1.5, "type": "shadow", "meta": {"y": [1, 2]}}
+
+    async def steps(store):
+        await store.add_node("n", ["Node"], first)
+        await store.add_node("n", ["Host"], second)
+
+    node = _run(tmp_path / "g.db", steps)["n"]
+    expected = dict(first)
+    expected.update(second)
+    props = {k: v for k, v in node.items() if k not in ("id", "labels")}
+    assert props == expected
+    assert list(props) == list(expected)
+    assert node["labels"] == ["Host", "Node"]
+
+
+def test_bulk_update_merges_odd_keys(tmp_path):
+    async def steps(store):
+        await store.add_nodes_bulk([("b", ["Node"], {"a": 1})])
+        await store.add_nodes_bulk([("b", ["Node"], {'k"ey': 2}), ("b", ["Node"], {"a": 3})])
+
+    node = _run(tmp_path / "g.db", steps)["b"]
+    assert node["a"] == 3
+    assert node['k"ey'] == 2
+
+
+def test_noop_upserts_leave_version_unchanged(tmp_path):
+    versions = []
+
+    async def steps(store):
+        nodes = [("a", ["Node"], {"type": "internal"}), ("b", ["Node"], {"type": "external"})]
+        edges = [("a", "b", "TALKS_TO", {"protocol": "TCP", "byte_count": 10})]
+        await store.add_nodes_bulk(nodes)
+        await store.add_edges_bulk(edges)
+        versions.append(store.get_version())
+        await store.add_nodes_bulk(nodes)
+        await store.add_edges_bulk(edges)
+        await store.add_edge(*edges[0])
+        versions.append(store.get_version())
+        await store.add_edges_bulk([("a", "b", "TALKS_TO", {"protocol": "TCP", "byte_count": 20})])
+        versions.append(store.get_version())
+
+    _run(tmp_path / "g.db", steps)
+    assert versions[0] == versions[1] < versions[2]
+
+
+def test_update_keeps_full_float_precision(tmp_path):
+    first = {"a": 0.30000000000000004, "ts": 1.5}
+    second = {"ts": 1760000000.1234567, "b": 2.0000000000000004}
+
+    async def steps(store):
+        await store.add_node("n", ["Node"], first)
+        await store.add_node("n", ["Node"], second)
+        await store.add_nodes_bulk([("m", ["Node"], first), ("m", ["Node"], {"x": None, **second})])
+
+    nodes = _run(tmp_path / "g.db", steps)
+    for node_id, extra in (("n", {}), ("m", {"x": None})):
+        props = {k: v for k, v in nodes[node_id].items() if k not in ("id", "labels")}
+        assert props == {**first, **extra, **second}
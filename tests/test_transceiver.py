@@ -0,0 +1,33 @@
+import asyncio
+import json
+
+import numpy as np
+
+from services.api.transceiver import ConnectionManager
+
+
+class _FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def test_broadcast_serializes_numpy_scalars():
+    manager = ConnectionManager()
+    ws = _FakeSocket()
+    manager.active_connections.append(ws)
+
+    payload = {"type": "alert", "payload": {
+        "ml_confidence": np.float64(0.912),
+        "ml_risk_score": np.float32(0.5),
+        "count": np.int64(3),
+        "is_anomalous": np.bool_(True),
+    }}
+    asyncio.run(manager.broadcast(payload))
+
+    assert manager.active_connections == [ws]
+    assert json.loads(ws.sent[0])["payload"] == {
+        "ml_confidence": 0.912, "ml_risk_score": 0.5, "count": 3, "is_anomalous": True,
+    }